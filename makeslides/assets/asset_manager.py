@@ -7,10 +7,14 @@ used in the slide creation process. It maintains a cache of assets to avoid
 redundant downloads and generation.
 """
 from __future__ import annotations
-import argparse, json, logging, os, sys, shutil, hashlib
+import argparse, functools, logging, mmap, os, sys, shutil, hashlib, sqlite3, threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Any, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 
 LOGGER = logging.getLogger("asset_manager")
@@ -18,6 +22,123 @@ LOGGER = logging.getLogger("asset_manager")
 # Default paths
 DEFAULT_CACHE_DIR = Path.home() / ".makeslides" / "assets"
 DEFAULT_CACHE_FILE = DEFAULT_CACHE_DIR / "asset_cache.json"
+CACHE_DB_NAME = "asset_cache.db"
+
+# Let SQLite read the cache database through a memory map of up to this many bytes
+CACHE_MMAP_SIZE = 256 * 1024 * 1024
+
+# Cache directories already created by AssetManager instances in this process
+_CREATED_DIRS: set = set()
+
+# Concurrent downloads used by update_json
+DOWNLOAD_WORKERS = 16
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Maximum number of keys per batched "IN (...)" cache lookup
+LOOKUP_BATCH_SIZE = 500
+
+# Slide JSON files at least this large are memory-mapped instead of read into a buffer
+MMAP_THRESHOLD = 1024 * 1024
+
+# Commit pending cache changes after this many mutations even if the manager stays open
+CACHE_FLUSH_INTERVAL = 50
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    url TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    category TEXT,
+    hash TEXT,
+    ts REAL
+);
+CREATE TABLE IF NOT EXISTS diagrams (
+    hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    type TEXT,
+    ts REAL
+);
+"""
+
+class ImageRecord(NamedTuple):
+    """A cached image as yielded by AssetManager.iter_images()."""
+    url: str
+    path: str
+    category: Optional[str]
+    timestamp: float
+
+class DiagramRecord(NamedTuple):
+    """A cached diagram as yielded by AssetManager.iter_diagrams()."""
+    hash: str
+    path: str
+    type: Optional[str]
+    timestamp: float
+
+@functools.lru_cache(maxsize=2048)
+def _url_hash(url: str) -> str:
+    """Short, stable key for an image URL."""
+    return hashlib.blake2b(url.encode(), digest_size=5).hexdigest()
+
+@functools.lru_cache(maxsize=2048)
+def _content_hash(content: str) -> str:
+    """Short, stable key for diagram content."""
+    return hashlib.blake2b(content.encode(), digest_size=5).hexdigest()
+
+@functools.lru_cache(maxsize=2048)
+def _legacy_content_hash(content: str) -> str:
+    """MD5-prefix key used for diagrams cached by older versions."""
+    return hashlib.md5(content.encode()).hexdigest()[:10]
+
+def _load_json_file(path: Path) -> Any:
+    """Parse a JSON file, memory-mapping it when it is large."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+def _write_json_file(path: Path, data: Any):
+    """Write JSON atomically: serialise to a temp file beside path, then rename it over path."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+def _clone_or_copy(src: Path, dst: Path, hardlink: bool = False):
+    """Copy src to dst, preferring a hard link or an in-kernel copy over a userspace copy.
+    
+    Hard links are only attempted when requested, since the two paths then share
+    one file. copy_file_range lets the kernel copy (or reflink, on btrfs/xfs)
+    without bouncing the bytes through Python; shutil.copy2 is the last resort.
+    """
+    if dst.exists() and os.path.samefile(src, dst):
+        return
+    
+    if hardlink:
+        try:
+            dst.unlink(missing_ok=True)
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining <= 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    
+    shutil.copy2(src, dst)
 
 def cli() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Manage assets for MakeSlides")
@@ -51,10 +172,14 @@ def cli() -> argparse.Namespace:
     update_cmd = subparsers.add_parser("update-json", help="Update JSON files with asset paths")
     update_cmd.add_argument("json_file", help="JSON file to update")
     update_cmd.add_argument("--output", help="Output file (default: overwrite input)")
+    update_cmd.add_argument("--copy-assets", action="store_true",
+                            help="Copy cached images into the deck's images/ directory instead of referencing the cache")
     
     # Common arguments
     p.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache directory")
-    p.add_argument("--cache-file", default=DEFAULT_CACHE_FILE, help="Cache file")
+    p.add_argument("--cache-file", default=DEFAULT_CACHE_FILE, help="Legacy JSON cache file to import")
+    p.add_argument("--hardlink", action="store_true",
+                   help="Hard-link cached assets instead of copying them (linked files share content)")
     p.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     
     return p.parse_args()
@@ -68,60 +193,169 @@ def setup_logging(level: str):
     )
 
 class AssetManager:
-    """Manages assets (images, diagrams) for slide creation."""
+    """Manages assets (images, diagrams) for slide creation.
+    
+    Cache changes are committed in batches; use the manager as a context
+    manager (or call close()) so the final batch is written.
+    """
     
-    def __init__(self, cache_dir: Path, cache_file: Path):
+    def __init__(self, cache_dir: Path, cache_file: Path, hardlink: bool = False):
         """Initialize the asset manager.
         
         Args:
             cache_dir: Directory to store cached assets
-            cache_file: File to store cache metadata
+            cache_file: Legacy JSON cache file, imported into the database if present
+            hardlink: Hard-link assets between the cache and decks instead of copying
         """
         self.cache_dir = cache_dir
         self.images_dir = cache_dir / "images"
         self.diagrams_dir = cache_dir / "diagrams"
         self.cache_file = cache_file
-        
-        # Create directories if they don't exist
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.images_dir.mkdir(exist_ok=True)
-        self.diagrams_dir.mkdir(exist_ok=True)
-        
-        # Load cache
-        self.cache = self._load_cache()
+        self.hardlink = hardlink
+        self.db_path = cache_dir / CACHE_DB_NAME
+        
+        # Create directories if they don't exist (once per process)
+        for directory in (self.cache_dir, self.images_dir, self.diagrams_dir):
+            if directory not in _CREATED_DIRS:
+                directory.mkdir(parents=True, exist_ok=True)
+                _CREATED_DIRS.add(directory)
+        self._known_dirs = {self.cache_dir, self.images_dir, self.diagrams_dir}
+        
+        # Open cache database (shared by download worker threads)
+        self._lock = threading.RLock()
+        self._dirty = 0  # mutations since the last commit
+        self.db = self._load_cache()
+        self._import_json_cache()
+        
+        # Reuse keep-alive HTTP connections across downloads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.2),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
     
-    def _load_cache(self) -> Dict[str, Any]:
-        """Load the asset cache from disk."""
-        if not self.cache_file.exists():
-            LOGGER.info(f"Cache file not found at {self.cache_file}. Creating new cache.")
-            return {
-                "images": {},
-                "diagrams": {},
-                "last_updated": time.time()
-            }
+    def _load_cache(self) -> sqlite3.Connection:
+        """Open the SQLite asset cache, creating the tables on first run."""
+        db = sqlite3.connect(self.db_path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(f"PRAGMA mmap_size={CACHE_MMAP_SIZE}")
+        db.executescript(CACHE_SCHEMA)
+        LOGGER.debug("Opened asset cache at %s", self.db_path)
+        return db
+    
+    def _import_json_cache(self):
+        """Import entries from a legacy JSON cache file, then set the file aside."""
+        if not self.cache_file or not self.cache_file.exists():
+            return
         
         try:
-            with open(self.cache_file, 'r') as f:
-                cache = json.load(f)
-            LOGGER.debug(f"Loaded cache with {len(cache.get('images', {}))} images and {len(cache.get('diagrams', {}))} diagrams")
-            return cache
+            legacy = orjson.loads(self.cache_file.read_bytes())
         except Exception as e:
-            LOGGER.warning(f"Error loading cache: {e}. Creating new cache.")
-            return {
-                "images": {},
-                "diagrams": {},
-                "last_updated": time.time()
-            }
+            LOGGER.warning("Error reading legacy cache %s: %s. Skipping import.", self.cache_file, e)
+            return
+        
+        images = []
+        for url, info in legacy.get("images", {}).items():
+            if not isinstance(info, dict) or not info.get("path"):
+                LOGGER.warning("Skipping malformed legacy image cache entry for %s", url)
+                continue
+            images.append((url, info["path"], info.get("category"), info.get("hash"), info.get("timestamp", 0)))
+        diagrams = []
+        for content_hash, info in legacy.get("diagrams", {}).items():
+            if not isinstance(info, dict) or not info.get("path"):
+                LOGGER.warning("Skipping malformed legacy diagram cache entry %s", content_hash)
+                continue
+            diagrams.append((content_hash, info["path"], info.get("type"), info.get("timestamp", 0)))
+        self.db.executemany("INSERT OR IGNORE INTO images VALUES (?, ?, ?, ?, ?)", images)
+        self.db.executemany("INSERT OR IGNORE INTO diagrams VALUES (?, ?, ?, ?)", diagrams)
+        self._save_cache()
+        
+        backup = self.cache_file.with_name(self.cache_file.name + ".bak")
+        self.cache_file.replace(backup)
+        LOGGER.info("Imported %d images and %d diagrams from %s (moved to %s)",
+                    len(images), len(diagrams), self.cache_file, backup)
     
     def _save_cache(self):
-        """Save the asset cache to disk."""
-        self.cache["last_updated"] = time.time()
+        """Commit pending cache changes to disk."""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-            LOGGER.debug(f"Saved cache to {self.cache_file}")
+            with self._lock:
+                self.db.commit()
+                self._dirty = 0
+            LOGGER.debug("Saved cache to %s", self.db_path)
         except Exception as e:
-            LOGGER.error(f"Error saving cache: {e}")
+            LOGGER.error("Error saving cache: %s", e)
+    
+    def _mark_dirty(self):
+        """Record a cache mutation, committing every CACHE_FLUSH_INTERVAL changes."""
+        with self._lock:
+            self._dirty += 1
+            if self._dirty >= CACHE_FLUSH_INTERVAL:
+                self._save_cache()
+    
+    def close(self):
+        """Commit pending changes, close the cache database and HTTP session."""
+        if self._dirty:
+            self._save_cache()
+        self.db.close()
+        self.session.close()
+    
+    def __enter__(self) -> "AssetManager":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _cached_image_path(self, url: str) -> Optional[Path]:
+        """Return the cached path recorded for an image URL, if any."""
+        with self._lock:
+            row = self.db.execute("SELECT path FROM images WHERE url = ?", (url,)).fetchone()
+        return Path(row[0]) if row else None
+    
+    def _cached_image_paths(self, urls) -> Dict[str, Path]:
+        """Look up cached paths for many image URLs with batched queries."""
+        urls = list(urls)
+        found: Dict[str, Path] = {}
+        with self._lock:
+            for i in range(0, len(urls), LOOKUP_BATCH_SIZE):
+                batch = urls[i:i + LOOKUP_BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                for url, path in self.db.execute(
+                    f"SELECT url, path FROM images WHERE url IN ({placeholders})", batch
+                ):
+                    found[url] = Path(path)
+        return found
+    
+    def _cached_diagram_path(self, content: str) -> Optional[Path]:
+        """Return the cached path recorded for diagram content, if any.
+        
+        Entries cached before the switch to BLAKE2 are keyed by an MD5 prefix,
+        so that key is checked as a fallback.
+        """
+        keys = (_content_hash(content), _legacy_content_hash(content))
+        with self._lock:
+            for key in keys:
+                row = self.db.execute("SELECT path FROM diagrams WHERE hash = ?", (key,)).fetchone()
+                if row:
+                    return Path(row[0])
+        return None
+    
+    def _materialize(self, src: Path, dst: Optional[Path]) -> Path:
+        """Place a copy of src at dst, if given, and return the path callers should use."""
+        if not dst:
+            return src
+        
+        dst = Path(dst)
+        parent = dst.parent
+        if parent not in self._known_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(parent)
+        
+        _clone_or_copy(src, dst, self.hardlink)
+        LOGGER.debug("Copied %s to %s", src, dst)
+        return dst
     
     def get_image(self, url: str, category: Optional[str] = None, local_path: Optional[Path] = None) -> Path:
         """Get or cache an image.
@@ -135,26 +369,17 @@ class AssetManager:
             Path to the cached image
         """
         # Generate a hash for the URL
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:10]
+        url_hash = _url_hash(url)
         
         # Check if image is already in cache
-        if url in self.cache["images"]:
-            cached_path = Path(self.cache["images"][url]["path"])
+        cached_path = self._cached_image_path(url)
+        if cached_path is not None:
             if cached_path.exists():
-                LOGGER.info(f"Using cached image for {url}")
-                
-                # If local_path is provided, copy the image
-                if local_path:
-                    local_path = Path(local_path)
-                    local_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(cached_path, local_path)
-                    LOGGER.debug(f"Copied cached image to {local_path}")
-                    return local_path
-                
-                return cached_path
+                LOGGER.info("Using cached image for %s", url)
+                return self._materialize(cached_path, local_path)
         
         # Image not in cache or file missing, download it
-        LOGGER.info(f"Downloading image from {url}")
+        LOGGER.info("Downloading image from %s", url)
         
         try:
             # Determine file extension from URL
@@ -166,35 +391,25 @@ class AssetManager:
             filename = f"img_{url_hash}{ext}"
             img_path = self.images_dir / filename
             
-            # Download the image
-            response = requests.get(url, stream=True, timeout=10)
-            response.raise_for_status()
-            
-            with open(img_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Download the image, streaming straight to disk in 1 MiB blocks
+            with self.session.get(url, stream=True, timeout=10) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(img_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_BUFFER_SIZE)
             
             # Update cache
-            self.cache["images"][url] = {
-                "path": str(img_path),
-                "category": category,
-                "hash": url_hash,
-                "timestamp": time.time()
-            }
-            self._save_cache()
-            
-            # If local_path is provided, copy the image
-            if local_path:
-                local_path = Path(local_path)
-                local_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(img_path, local_path)
-                LOGGER.debug(f"Copied downloaded image to {local_path}")
-                return local_path
+            with self._lock:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?)",
+                    (url, str(img_path), category, url_hash, time.time())
+                )
+                self._mark_dirty()
             
-            return img_path
+            return self._materialize(img_path, local_path)
             
         except Exception as e:
-            LOGGER.error(f"Error downloading image from {url}: {e}")
+            LOGGER.error("Error downloading image from %s: %s", url, e)
             raise
     
     def get_diagram(self, content: str, diagram_type: str = "flowchart", local_path: Optional[Path] = None) -> Optional[Path]:
@@ -209,37 +424,27 @@ class AssetManager:
             Path to the cached diagram or None if not found
         """
         # Generate a hash for the content
-        content_hash = hashlib.md5(content.encode()).hexdigest()[:10]
+        content_hash = _content_hash(content)
         
         # Check if diagram is already in cache
-        if content_hash in self.cache["diagrams"]:
-            cached_info = self.cache["diagrams"][content_hash]
-            cached_path = Path(cached_info["path"])
-            
+        cached_path = self._cached_diagram_path(content)
+        if cached_path is not None:
             if cached_path.exists():
-                LOGGER.info(f"Using cached diagram for hash {content_hash}")
+                LOGGER.info("Using cached diagram for hash %s", content_hash)
                 
-                # If local_path is provided, copy the diagram
+                # If local_path is provided, copy the diagram and its SVG
                 if local_path:
-                    local_path = Path(local_path)
-                    local_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(cached_path, local_path)
-                    
-                    # Also copy SVG if it exists
+                    local_path = self._materialize(cached_path, local_path)
                     svg_path = cached_path.with_suffix(".svg")
                     if svg_path.exists():
-                        local_svg_path = local_path.with_suffix(".svg")
-                        shutil.copy2(svg_path, local_svg_path)
-                        LOGGER.debug(f"Copied cached SVG to {local_svg_path}")
-                    
-                    LOGGER.debug(f"Copied cached diagram to {local_path}")
+                        self._materialize(svg_path, local_path.with_suffix(".svg"))
                     return local_path
                 
                 return cached_path
         
         # If we're just checking and not generating, return None
         if local_path is None:
-            LOGGER.info(f"Diagram {content_hash} not found in cache")
+            LOGGER.info("Diagram %s not found in cache", content_hash)
             return None
         
         # If local_path is provided, assume it's a newly generated diagram we want to cache
@@ -251,30 +456,68 @@ class AssetManager:
                 cached_path = self.diagrams_dir / cached_filename
                 
                 # Copy to cache
-                shutil.copy2(local_path, cached_path)
-                LOGGER.info(f"Cached new diagram as {cached_path}")
+                self._materialize(local_path, cached_path)
+                LOGGER.info("Cached new diagram as %s", cached_path)
                 
                 # Also copy SVG if it exists
                 local_svg_path = local_path.with_suffix(".svg")
                 if local_svg_path.exists():
-                    cached_svg_path = cached_path.with_suffix(".svg")
-                    shutil.copy2(local_svg_path, cached_svg_path)
-                    LOGGER.debug(f"Cached SVG as {cached_svg_path}")
+                    self._materialize(local_svg_path, cached_path.with_suffix(".svg"))
                 
                 # Update cache
-                self.cache["diagrams"][content_hash] = {
-                    "path": str(cached_path),
-                    "type": diagram_type,
-                    "hash": content_hash,
-                    "timestamp": time.time()
-                }
-                self._save_cache()
+                with self._lock:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO diagrams VALUES (?, ?, ?, ?)",
+                        (content_hash, str(cached_path), diagram_type, time.time())
+                    )
+                    self._mark_dirty()
                 
                 return local_path
         
-        LOGGER.error(f"No local path provided for diagram {content_hash}")
+        LOGGER.error("No local path provided for diagram %s", content_hash)
         return None
     
+    @staticmethod
+    def _scan_files(directory: Path) -> frozenset:
+        """Names of the regular files in a directory, from a single scandir pass."""
+        try:
+            with os.scandir(directory) as entries:
+                return frozenset(entry.name for entry in entries if entry.is_file())
+        except FileNotFoundError:
+            return frozenset()
+    
+    @staticmethod
+    def _is_cached_file(path, directory: str, names: frozenset) -> bool:
+        """Check a cache entry's file against a scandir index, stat-ing only paths outside it."""
+        head, name = os.path.split(path)
+        if head == directory:
+            return name in names
+        return os.path.exists(path)
+    
+    def iter_images(self, category: Optional[str] = None) -> Iterator[ImageRecord]:
+        """Yield cached images whose files still exist, optionally filtered by category."""
+        images_dir = str(self.images_dir)
+        image_files = self._scan_files(self.images_dir)
+        if category is None:
+            rows = self.db.execute("SELECT url, path, category, ts FROM images")
+        else:
+            rows = self.db.execute(
+                "SELECT url, path, category, ts FROM images WHERE category = ?", (category,)
+            )
+        for url, path, img_category, ts in rows:
+            if self._is_cached_file(path, images_dir, image_files):
+                yield ImageRecord(url, path, img_category, ts or 0)
+    
+    def iter_diagrams(self) -> Iterator[DiagramRecord]:
+        """Yield cached diagrams whose files still exist."""
+        diagrams_dir = str(self.diagrams_dir)
+        diagram_files = self._scan_files(self.diagrams_dir)
+        for content_hash, path, diagram_type, ts in self.db.execute(
+            "SELECT hash, path, type, ts FROM diagrams"
+        ):
+            if self._is_cached_file(path, diagrams_dir, diagram_files):
+                yield DiagramRecord(content_hash, path, diagram_type, ts or 0)
+    
     def list_assets(self, category: Optional[str] = None, asset_type: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
         """List all cached assets, optionally filtered by category or type.
         
@@ -287,30 +530,11 @@ class AssetManager:
         """
         result = {"images": [], "diagrams": []}
         
-        # Filter images
         if asset_type is None or asset_type == "image":
-            for url, info in self.cache["images"].items():
-                if category is None or info.get("category") == category:
-                    asset_path = Path(info["path"])
-                    if asset_path.exists():
-                        result["images"].append({
-                            "url": url,
-                            "path": info["path"],
-                            "category": info.get("category"),
-                            "timestamp": info.get("timestamp", 0)
-                        })
-        
-        # Filter diagrams
+            result["images"] = [record._asdict() for record in self.iter_images(category)]
+        
         if asset_type is None or asset_type == "diagram":
-            for content_hash, info in self.cache["diagrams"].items():
-                asset_path = Path(info["path"])
-                if asset_path.exists():
-                    result["diagrams"].append({
-                        "hash": content_hash,
-                        "path": info["path"],
-                        "type": info.get("type"),
-                        "timestamp": info.get("timestamp", 0)
-                    })
+            result["diagrams"] = [record._asdict() for record in self.iter_diagrams()]
         
         return result
     
@@ -329,65 +553,78 @@ class AssetManager:
         
         images_removed = 0
         diagrams_removed = 0
+        images_dir, diagrams_dir = str(self.images_dir), str(self.diagrams_dir)
+        image_files = self._scan_files(self.images_dir)
+        diagram_files = self._scan_files(self.diagrams_dir)
         
         # Clean images
         images_to_remove = []
-        for url, info in self.cache["images"].items():
-            if remove_unused or info.get("timestamp", 0) < threshold:
-                try:
-                    path = Path(info["path"])
-                    if path.exists():
-                        path.unlink()
-                        images_removed += 1
-                    images_to_remove.append(url)
-                except Exception as e:
-                    LOGGER.warning(f"Error removing image {url}: {e}")
+        for url, path in self.db.execute(
+            "SELECT url, path FROM images WHERE ? OR COALESCE(ts, 0) < ?", (remove_unused, threshold)
+        ).fetchall():
+            try:
+                path = Path(path)
+                if self._is_cached_file(path, images_dir, image_files):
+                    path.unlink()
+                    images_removed += 1
+                images_to_remove.append((url,))
+            except Exception as e:
+                LOGGER.warning("Error removing image %s: %s", url, e)
         
         # Remove from cache
-        for url in images_to_remove:
-            del self.cache["images"][url]
+        self.db.executemany("DELETE FROM images WHERE url = ?", images_to_remove)
         
         # Clean diagrams
         diagrams_to_remove = []
-        for content_hash, info in self.cache["diagrams"].items():
-            if remove_unused or info.get("timestamp", 0) < threshold:
-                try:
-                    path = Path(info["path"])
-                    if path.exists():
-                        path.unlink()
-                        # Also remove SVG if it exists
-                        svg_path = path.with_suffix(".svg")
-                        if svg_path.exists():
-                            svg_path.unlink()
-                        diagrams_removed += 1
-                    diagrams_to_remove.append(content_hash)
-                except Exception as e:
-                    LOGGER.warning(f"Error removing diagram {content_hash}: {e}")
-        
+        for content_hash, path in self.db.execute(
+            "SELECT hash, path FROM diagrams WHERE ? OR COALESCE(ts, 0) < ?", (remove_unused, threshold)
+        ).fetchall():
+            try:
+                path = Path(path)
+                if self._is_cached_file(path, diagrams_dir, diagram_files):
+                    path.unlink()
+                    # Also remove SVG if it exists
+                    svg_path = path.with_suffix(".svg")
+                    if self._is_cached_file(svg_path, diagrams_dir, diagram_files):
+                        svg_path.unlink()
+                    diagrams_removed += 1
+                diagrams_to_remove.append((content_hash,))
+            except Exception as e:
+                LOGGER.warning("Error removing diagram %s: %s", content_hash, e)
+
         # Remove from cache
-        for content_hash in diagrams_to_remove:
-            del self.cache["diagrams"][content_hash]
-        
-        # Save cache
+        self.db.executemany("DELETE FROM diagrams WHERE hash = ?", diagrams_to_remove)
+
+        # Record the deletions and return the freed pages to the filesystem
         self._save_cache()
+        if images_to_remove or diagrams_to_remove:
+            with self._lock:
+                self.db.execute("VACUUM")
         
         return images_removed, diagrams_removed
     
-    def update_json(self, json_path: Path, output_path: Optional[Path] = None) -> int:
+    def _download_to_deck(self, url: str, json_dir: Path) -> Path:
+        """Download (or reuse) an image and place a copy in the deck's images directory."""
+        img_file = json_dir / "images" / f"img_{_url_hash(url)}.jpg"
+        return self.get_image(url, local_path=img_file)
+    
+    def update_json(self, json_path: Path, output_path: Optional[Path] = None,
+                    copy_assets: bool = False) -> int:
         """Update a slides JSON file with cached asset paths.
         
         Args:
             json_path: Path to the JSON file
             output_path: Optional output path (default: overwrite input)
+            copy_assets: Copy cached images next to the JSON file so the deck is
+                self-contained, instead of pointing relative paths into the cache
             
         Returns:
             Number of assets updated
         """
         try:
-            with open(json_path, 'r') as f:
-                slides_data = json.load(f)
+            slides_data = _load_json_file(json_path)
         except Exception as e:
-            LOGGER.error(f"Error loading JSON from {json_path}: {e}")
+            LOGGER.error("Error loading JSON from %s: %s", json_path, e)
             return 0
         
         # Check if it's an object with a slides array
@@ -396,72 +633,90 @@ class AssetManager:
         elif isinstance(slides_data, list):
             slides = slides_data
         else:
-            LOGGER.error(f"Unexpected JSON structure in {json_path}")
+            LOGGER.error("Unexpected JSON structure in %s", json_path)
             return 0
         
         assets_updated = 0
+        json_dir = json_path.parent
         
-        # Update each slide
+        # Classify slides in a single pass: remote image references and diagrams
+        remote: Dict[str, List[Dict[str, Any]]] = {}
+        diagram_slides: List[Dict[str, Any]] = []
         for slide in slides:
-            # Update image URLs
             image_url = slide.get("image_url")
             if image_url and image_url.startswith("http"):
+                remote.setdefault(image_url, []).append(slide)
+            if slide.get("diagram_content") and slide.get("diagram_type"):
+                diagram_slides.append(slide)
+        
+        # Resolve remote images: cached files are referenced by relative path (or
+        # copied into the deck with copy_assets); copies and downloads share one worker pool
+        cached = self._cached_image_paths(remote)
+        resolved: Dict[str, Path] = {}
+        pending = {}
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            for image_url, cached_path in cached.items():
+                if not cached_path.exists():
+                    continue
+                if copy_assets and not cached_path.is_relative_to(json_dir):
+                    # Copy the cached file into the deck's images directory
+                    pending[image_url] = executor.submit(
+                        self._materialize, cached_path, json_dir / "images" / cached_path.name
+                    )
+                else:
+                    resolved[image_url] = cached_path
+            
+            misses = [url for url in remote if url not in cached]
+            if misses:
+                LOGGER.info("Downloading %d images with up to %d workers", len(misses), DOWNLOAD_WORKERS)
+            for image_url in misses:
+                pending[image_url] = executor.submit(self._download_to_deck, image_url, json_dir)
+        
+        for image_url, future in pending.items():
+            try:
+                resolved[image_url] = future.result()
+            except Exception as e:
+                LOGGER.warning("Error updating image URL %s: %s", image_url, e)
+        
+        for image_url, path in resolved.items():
+            try:
+                rel_path = os.path.relpath(path, json_dir)
+            except ValueError:
+                # No relative path between drives on Windows; copy into the deck as --copy-assets does
                 try:
-                    # Check if the image is in the cache
-                    if image_url in self.cache["images"]:
-                        cached_path = Path(self.cache["images"][image_url]["path"])
-                        if cached_path.exists():
-                            # Use relative path from JSON file to cached image
-                            try:
-                                json_dir = json_path.parent
-                                rel_path = cached_path.relative_to(json_dir)
-                                slide["image_url"] = str(rel_path)
-                                assets_updated += 1
-                                LOGGER.debug(f"Updated image URL to {rel_path}")
-                            except ValueError:
-                                # If the cached path is not relative to the JSON file,
-                                # download and cache it in the same directory
-                                new_path = json_dir / "images" / cached_path.name
-                                new_path.parent.mkdir(parents=True, exist_ok=True)
-                                shutil.copy2(cached_path, new_path)
-                                rel_path = new_path.relative_to(json_dir)
-                                slide["image_url"] = str(rel_path)
-                                assets_updated += 1
-                                LOGGER.debug(f"Copied image to {rel_path}")
-                    else:
-                        # Download and cache the image
-                        img_dir = json_path.parent / "images"
-                        img_dir.mkdir(parents=True, exist_ok=True)
-                        img_file = img_dir / f"img_{hashlib.md5(image_url.encode()).hexdigest()[:10]}.jpg"
-                        cached_path = self.get_image(image_url, local_path=img_file)
-                        rel_path = cached_path.relative_to(json_path.parent)
-                        slide["image_url"] = str(rel_path)
-                        assets_updated += 1
-                        LOGGER.debug(f"Downloaded and cached image to {rel_path}")
+                    path = self._materialize(path, json_dir / "images" / path.name)
                 except Exception as e:
-                    LOGGER.warning(f"Error updating image URL {image_url}: {e}")
+                    LOGGER.warning("Error updating image URL %s: %s", image_url, e)
+                    continue
+                rel_path = os.path.relpath(path, json_dir)
+            # The JSON is shared across platforms, so always use forward slashes
+            rel_path = Path(rel_path).as_posix()
+            for slide in remote[image_url]:
+                slide["image_url"] = rel_path
+                assets_updated += 1
+            LOGGER.debug("Updated image URL %s to %s", image_url, rel_path)
+        
+        # Cache diagram content
+        for slide in diagram_slides:
+            diagram_content = slide["diagram_content"]
+            if self._cached_diagram_path(diagram_content) is not None:
+                # Diagram already in cache, nothing to do
+                continue
             
-            # Cache diagram content
-            diagram_content = slide.get("diagram_content")
-            diagram_type = slide.get("diagram_type")
-            
-            if diagram_content and diagram_type:
-                content_hash = hashlib.md5(diagram_content.encode()).hexdigest()[:10]
-                if content_hash in self.cache["diagrams"]:
-                    # Diagram already in cache, nothing to do
-                    pass
-                else:
-                    # Check if diagram files exist
-                    json_dir = json_path.parent
-                    img_url = slide.get("image_url")
-                    
-                    if img_url and not img_url.startswith("http"):
-                        img_path = json_dir / img_url
-                        if img_path.exists():
-                            # Cache the existing diagram
-                            self.get_diagram(diagram_content, diagram_type, local_path=img_path)
-                            assets_updated += 1
-                            LOGGER.debug(f"Cached existing diagram from {img_path}")
+            # Check if diagram files exist
+            img_url = slide.get("image_url")
+            if img_url and not img_url.startswith("http"):
+                img_path = json_dir / img_url
+                if img_path.exists():
+                    # Cache the existing diagram
+                    self.get_diagram(diagram_content, slide["diagram_type"], local_path=img_path)
+                    assets_updated += 1
+                    LOGGER.debug("Cached existing diagram from %s", img_path)
+        
+        # Nothing changed and we would overwrite the input: skip the rewrite
+        if assets_updated == 0 and not output_path:
+            LOGGER.info("No assets updated in %s", json_path)
+            return 0
         
         # Save the updated JSON
         if output_path:
@@ -472,15 +727,13 @@ class AssetManager:
         try:
             if isinstance(slides_data, dict) and "slides" in slides_data:
                 slides_data["slides"] = slides
-                with open(out_path, 'w') as f:
-                    json.dump(slides_data, f, indent=2)
+                _write_json_file(out_path, slides_data)
             else:
-                with open(out_path, 'w') as f:
-                    json.dump(slides, f, indent=2)
+                _write_json_file(out_path, slides)
             
-            LOGGER.info(f"Updated {assets_updated} assets in {out_path}")
+            LOGGER.info("Updated %d assets in %s", assets_updated, out_path)
         except Exception as e:
-            LOGGER.error(f"Error saving updated JSON: {e}")
+            LOGGER.error("Error saving updated JSON: %s", e)
         
         return assets_updated
 
@@ -491,44 +744,44 @@ def main():
     # Create asset manager
     cache_dir = Path(args.cache_dir)
     cache_file = Path(args.cache_file)
-    manager = AssetManager(cache_dir, cache_file)
-    
-    # Execute command
-    if args.command == "get-image":
-        local_path = Path(args.local_path) if args.local_path else None
-        path = manager.get_image(args.url, args.category, local_path)
-        print(f"Image cached at: {path}")
-    
-    elif args.command == "get-diagram":
-        local_path = Path(args.local_path) if args.local_path else None
-        path = manager.get_diagram(args.content, args.type, local_path)
-        if path:
-            print(f"Diagram cached at: {path}")
+    with AssetManager(cache_dir, cache_file, hardlink=args.hardlink) as manager:
+        # Execute command
+        if args.command == "get-image":
+            local_path = Path(args.local_path) if args.local_path else None
+            path = manager.get_image(args.url, args.category, local_path)
+            print(f"Image cached at: {path}")
+    
+        elif args.command == "get-diagram":
+            local_path = Path(args.local_path) if args.local_path else None
+            path = manager.get_diagram(args.content, args.type, local_path)
+            if path:
+                print(f"Diagram cached at: {path}")
+            else:
+                print("Diagram not found in cache and no local path provided")
+    
+        elif args.command == "list":
+            print("\nImages:")
+            if args.type is None or args.type == "image":
+                for img in manager.iter_images(args.category):
+                    print(f"  - {img.url} -> {img.path}")
+        
+            print("\nDiagrams:")
+            if args.type is None or args.type == "diagram":
+                for diag in manager.iter_diagrams():
+                    print(f"  - {diag.hash} ({diag.type}) -> {diag.path}")
+    
+        elif args.command == "clean":
+            images, diagrams = manager.clean_cache(args.remove_unused, args.days)
+            print(f"Removed {images} images and {diagrams} diagrams from cache")
+    
+        elif args.command == "update-json":
+            json_path = Path(args.json_file)
+            output_path = Path(args.output) if args.output else None
+            assets_updated = manager.update_json(json_path, output_path, args.copy_assets)
+            print(f"Updated {assets_updated} assets in {json_path}")
+    
         else:
-            print("Diagram not found in cache and no local path provided")
-    
-    elif args.command == "list":
-        assets = manager.list_assets(args.category, args.type)
-        print("\nImages:")
-        for img in assets["images"]:
-            print(f"  - {img['url']} -> {img['path']}")
-        
-        print("\nDiagrams:")
-        for diag in assets["diagrams"]:
-            print(f"  - {diag['hash']} ({diag['type']}) -> {diag['path']}")
-    
-    elif args.command == "clean":
-        images, diagrams = manager.clean_cache(args.remove_unused, args.days)
-        print(f"Removed {images} images and {diagrams} diagrams from cache")
-    
-    elif args.command == "update-json":
-        json_path = Path(args.json_file)
-        output_path = Path(args.output) if args.output else None
-        assets_updated = manager.update_json(json_path, output_path)
-        print(f"Updated {assets_updated} assets in {json_path}")
-    
-    else:
-        print("No command specified. Use --help for usage information.")
+            print("No command specified. Use --help for usage information.")
 
 if __name__ == "__main__":
     main()
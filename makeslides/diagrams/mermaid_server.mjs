@@ -0,0 +1,51 @@
+#!/usr/bin/env node
+/*
+ * Long-lived Mermaid renderer used by renderer.py (--mermaid-server).
+ *
+ * Boots one headless browser through the globally installed
+ * @mermaid-js/mermaid-cli and renders diagrams sent as newline-delimited
+ * JSON on stdin:
+ *
+ *   {"id": 1, "src": "flowchart TD\n A-->B", "format": "png", "config": {...}}
+ *
+ * Each request gets one JSON line back on stdout:
+ *
+ *   {"id": 1, "data": "<base64 image bytes>"}   or   {"id": 1, "error": "..."}
+ */
+import { execSync } from "node:child_process";
+import { createRequire } from "node:module";
+import { join } from "node:path";
+import { createInterface } from "node:readline";
+import { pathToFileURL } from "node:url";
+
+function resolveGlobal(name) {
+  const root = process.env.MERMAID_CLI_ROOT || execSync("npm root -g").toString().trim();
+  return createRequire(join(root, "noop.js")).resolve(name);
+}
+
+const cliPath = resolveGlobal("@mermaid-js/mermaid-cli");
+const { renderMermaid } = await import(pathToFileURL(cliPath));
+const puppeteerPath = createRequire(cliPath).resolve("puppeteer");
+const puppeteer = (await import(pathToFileURL(puppeteerPath))).default;
+
+const browser = await puppeteer.launch({ headless: "new" });
+
+const reply = (message) => process.stdout.write(JSON.stringify(message) + "\n");
+
+const lines = createInterface({ input: process.stdin });
+for await (const line of lines) {
+  if (!line.trim()) continue;
+  let request;
+  try {
+    request = JSON.parse(line);
+    const { data } = await renderMermaid(browser, request.src, request.format || "png", {
+      mermaidConfig: request.config || {},
+      backgroundColor: "white",
+    });
+    reply({ id: request.id, data: Buffer.from(data).toString("base64") });
+  } catch (err) {
+    reply({ id: request ? request.id : null, error: String(err && err.message ? err.message : err) });
+  }
+}
+
+await browser.close();
@@ -18,15 +18,26 @@ Usage: python diagrams_to_images.py slides_your_file.json
 import os
 import sys
 import subprocess
-import json
 import logging
 import argparse
+import atexit
+import base64
+import functools
+import threading
 import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import re
+import shutil
 import tempfile
 from pathlib import Path
-import anthropic
+import orjson
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
 
 # Set up logging
 logging.basicConfig(
@@ -39,6 +50,51 @@ logger = logging.getLogger("diagrams_to_images")
 # Default Mermaid CLI command
 MERMAID_CMD = "mmdc"
 
+# Diagram type (and optional direction) that valid Mermaid sources start with
+MERMAID_PREFIX_RE = re.compile(
+    r'^(flowchart|mindmap|classDiagram|pie|quadrantChart|timeline|sequenceDiagram|stateDiagram-v2|gantt|journey|gitGraph)\s*([A-Z]{2})?'
+)
+
+# Edge syntax that marks a source as Mermaid even without a type prefix
+MERMAID_SYNTAX_TOKENS = ('-->', '-.->', '===>', '-->|', '-.->|', '==>|', '---|', '-.-|', '===|')
+
+# Concurrent diagram renders; more mmdc browsers than this tends to thrash
+RENDER_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Enforces RENDER_WORKERS process-wide, even when several files are processed at once
+_RENDER_SLOTS = threading.BoundedSemaphore(RENDER_WORKERS)
+
+# Shared on-disk cache of rendered diagrams, keyed by source, mmdc version and Mermaid config
+MERMAID_CACHE_DIR = Path.home() / ".cache" / "makeslides" / "mermaid"
+
+# Mermaid CLI version string, queried once per process
+_MMDC_VERSION = None
+
+# Whether mmdc accepts diagram sources on stdin ("-i -"); cleared on first failure
+_MMDC_STDIN = True
+
+# Lazily created MermaidCache instance
+_MERMAID_CACHE = None
+
+# Node script that keeps one browser alive for all renders (--mermaid-server)
+MERMAID_SERVER_SCRIPT = Path(__file__).with_name("mermaid_server.mjs")
+
+# Non-JSON stdout lines (console output) tolerated before a server reply
+MERMAID_SERVER_MAX_STRAY_LINES = 100
+
+# Whether render_mermaid should use the persistent server instead of mmdc
+USE_MERMAID_SERVER = False
+
+# Lazily started MermaidServer instance
+_MERMAID_SERVER = None
+_MERMAID_SERVER_LOCK = threading.Lock()
+
+# Minimal transparent PNG written when Pillow is unavailable for fallback images
+MINIMAL_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c4"
+    "890000000d4944415478da6364f8ffbf0600050001e36172eb0000000049454e44ae426082"
+)
+
 # Common diagram type mappings for fallbacks
 DIAGRAM_FALLBACKS = {
     "flowchart": ["flowchart TD", "flowchart LR", "flowchart RL", "mindmap"],
@@ -49,52 +105,329 @@ DIAGRAM_FALLBACKS = {
     "timeline": ["timeline", "flowchart TD"]
 }
 
+def get_mmdc_version():
+    """Return the installed Mermaid CLI version, querying mmdc only once."""
+    global _MMDC_VERSION
+    if _MMDC_VERSION is None:
+        try:
+            result = _run_checked([MERMAID_CMD, "--version"])
+            _MMDC_VERSION = result.stdout.decode("utf-8", errors="replace").strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            _MMDC_VERSION = "unknown"
+    return _MMDC_VERSION
+
+@functools.lru_cache(maxsize=None)
+def _fallback_font():
+    """Font for fallback error images, loaded once on first use."""
+    try:
+        return ImageFont.truetype("Arial", 20)
+    except IOError:
+        return ImageFont.load_default()
+
+def _file_size(path):
+    """Size of path in bytes, or 0 if it does not exist (a single stat call)."""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+def _unlink(path):
+    """Remove path if it exists."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def _atomic_copy(src, dst):
+    """Copy src to dst through a temporary file, replacing dst atomically.
+    
+    Always a real copy: renders later write into output files in place, which
+    would corrupt a cache entry sharing the same inode through a hardlink.
+    """
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+@functools.lru_cache(maxsize=16)
+def _config_digest(config_path, mtime_ns):
+    """Hash of a Mermaid config file's contents, memoized per modification time."""
+    with open(config_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+class MermaidCache:
+    """Content-addressed store of rendered diagrams shared across decks and runs."""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir or MERMAID_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(src, config_path=None):
+        """Cache key for a diagram source under the installed mmdc version and Mermaid config.
+        
+        The config file's contents are part of the key, so a theme or config
+        change never returns renders made with the old settings.
+        """
+        config = ""
+        if config_path:
+            try:
+                config = _config_digest(str(config_path), os.stat(config_path).st_mtime_ns)
+            except FileNotFoundError:
+                pass
+        return hashlib.sha256((src.strip() + '\0' + get_mmdc_version() + '\0' + config).encode()).hexdigest()
+
+    def fetch(self, key, png, svg):
+        """Copy cached renders to png/svg. Returns True on a cache hit.
+        
+        When only a PNG is cached, any older svg is removed so it cannot be
+        shown in place of the new PNG.
+        """
+        try:
+            _atomic_copy(self.cache_dir / f"{key}.png", png)
+        except FileNotFoundError:
+            return False
+        try:
+            _atomic_copy(self.cache_dir / f"{key}.svg", svg)
+        except FileNotFoundError:
+            _unlink(svg)
+        return True
+
+    def store(self, key, png, svg=None):
+        """Add freshly rendered png/svg files to the cache; svg is None if it failed to render."""
+        for path, ext in ((png, "png"), (svg, "svg")):
+            if path is None or not os.path.exists(path):
+                continue
+            try:
+                _atomic_copy(path, self.cache_dir / f"{key}.{ext}")
+            except OSError as e:
+                logger.warning(f"Could not cache rendered diagram {path}: {e}")
+
+def get_mermaid_cache():
+    """Return the shared MermaidCache, creating it on first use."""
+    global _MERMAID_CACHE
+    if _MERMAID_CACHE is None:
+        _MERMAID_CACHE = MermaidCache()
+    return _MERMAID_CACHE
+
+class MermaidRenderError(Exception):
+    """Raised when the persistent Mermaid server cannot render a diagram."""
+
+class MermaidServerUnavailable(MermaidRenderError):
+    """Raised when the Mermaid server process has died, so no diagram can render through it."""
+
+class MermaidServer:
+    """Long-lived Node process that renders diagrams with a single browser.
+    
+    Speaks newline-delimited JSON with mermaid_server.mjs over stdio, so the
+    Chromium startup cost is paid once per run instead of once per diagram.
+    """
+
+    def __init__(self, script=MERMAID_SERVER_SCRIPT):
+        # stderr goes to a file rather than a pipe nobody drains, so a crash can be reported
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self.process = subprocess.Popen(
+                ["node", str(script)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self._stderr
+            )
+        except OSError:
+            self._stderr.close()
+            raise
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._configs = {}
+
+    def _load_config(self, config_path):
+        """Parse and memoize a Mermaid config file."""
+        if not config_path or not os.path.exists(config_path):
+            return None
+        if config_path not in self._configs:
+            with open(config_path, 'rb') as f:
+                self._configs[config_path] = orjson.loads(f.read())
+        return self._configs[config_path]
+
+    def render(self, src, fmt="png", config_path=None):
+        """Render src and return the image bytes.
+        
+        Raises:
+            MermaidServerUnavailable: If the server process died or its replies are out of step
+            MermaidRenderError: If the diagram fails to render
+        """
+        with self._lock:
+            if self.process.poll() is not None:
+                raise MermaidServerUnavailable(f"Mermaid server exited with code {self.process.returncode}")
+            self._next_id += 1
+            request = {"id": self._next_id, "src": src, "format": fmt,
+                       "config": self._load_config(config_path)}
+            try:
+                self.process.stdin.write(orjson.dumps(request) + b"\n")
+                self.process.stdin.flush()
+                reply = self._read_reply(self._next_id)
+            except OSError as e:
+                raise MermaidServerUnavailable(f"Mermaid server unavailable: {e}") from e
+        if "error" in reply:
+            raise MermaidRenderError(reply["error"])
+        return base64.b64decode(reply["data"])
+
+    def _read_reply(self, request_id):
+        """Read stdout up to the JSON reply for request_id; call with _lock held.
+        
+        Stray non-JSON lines (Node or browser console output) are skipped, up
+        to MERMAID_SERVER_MAX_STRAY_LINES. A reply for any other request means
+        the stream is out of step, so the server is reported unavailable
+        rather than handing back another diagram's image.
+        """
+        for _ in range(MERMAID_SERVER_MAX_STRAY_LINES + 1):
+            line = self.process.stdout.readline()
+            if not line:
+                raise MermaidServerUnavailable("Mermaid server exited unexpectedly")
+            try:
+                reply = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                logger.debug(f"Mermaid server: {line.decode('utf-8', errors='replace').rstrip()}")
+                continue
+            if not isinstance(reply, dict) or reply.get("id") != request_id:
+                raise MermaidServerUnavailable(
+                    f"Mermaid server replied out of order (expected id {request_id}, got {line[:200]!r})")
+            return reply
+        raise MermaidServerUnavailable(
+            f"Mermaid server sent {MERMAID_SERVER_MAX_STRAY_LINES} lines without a JSON reply")
+
+    def render_to_file(self, src, path, config_path=None):
+        """Render src into path, choosing the format from its extension."""
+        data = self.render(src, Path(path).suffix.lstrip("."), config_path)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def stderr_tail(self, limit=4000):
+        """Last limit characters the Node process wrote to stderr."""
+        try:
+            self._stderr.seek(0, os.SEEK_END)
+            self._stderr.seek(max(0, self._stderr.tell() - limit))
+            return self._stderr.read().decode("utf-8", errors="replace").strip()
+        except (OSError, ValueError):
+            return ""
+
+    def close(self):
+        """Stop the Node process."""
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self._stderr.close()
+
+def get_mermaid_server():
+    """Return the shared MermaidServer if enabled, starting it on first use."""
+    global _MERMAID_SERVER, USE_MERMAID_SERVER
+    if not USE_MERMAID_SERVER:
+        return None
+    with _MERMAID_SERVER_LOCK:
+        if _MERMAID_SERVER is None and USE_MERMAID_SERVER:
+            try:
+                _MERMAID_SERVER = MermaidServer()
+                atexit.register(_MERMAID_SERVER.close)
+                logger.info("Started persistent Mermaid server")
+            except OSError as e:
+                logger.warning(f"Could not start Mermaid server, falling back to mmdc: {e}")
+                USE_MERMAID_SERVER = False
+        return _MERMAID_SERVER
+
+def disable_mermaid_server(error):
+    """Stop using a Mermaid server that died; later renders go through mmdc.
+    
+    Safe to call from several render threads; only the first call logs and
+    shuts the server down.
+    """
+    global _MERMAID_SERVER, USE_MERMAID_SERVER
+    with _MERMAID_SERVER_LOCK:
+        server, _MERMAID_SERVER = _MERMAID_SERVER, None
+        USE_MERMAID_SERVER = False
+    if server is None:
+        return
+    stderr = server.stderr_tail()
+    logger.warning(f"{error}; falling back to mmdc" + (f". Server output:\n{stderr}" if stderr else ""))
+    server.close()
+
 def validate_paths(json_path, output_dir=None, config_path=None):
-    """Validate and normalize all paths, creating directories if needed."""
+    """Validate and normalize all paths, creating directories if needed.
+    
+    Returns Path objects so callers can build per-slide paths without
+    re-splitting strings.
+    """
     # Check JSON file
-    if not os.path.exists(json_path):
+    json_path = Path(json_path)
+    if not json_path.exists():
         logger.error(f"JSON file not found: {json_path}")
-        return None, None, None
+        return None, None, None, None
     
     # Determine output directory
     if output_dir:
-        output_dir = os.path.abspath(output_dir)
+        output_dir = Path(output_dir).absolute()
     else:
-        output_dir = os.path.join(os.path.dirname(json_path), "images")
+        output_dir = json_path.parent / "images"
     
     # Create output directory if it doesn't exist
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     # Check Mermaid config
-    if config_path and not os.path.exists(config_path):
-        logger.warning(f"Mermaid config file not found: {config_path}, using default")
-        config_path = None
+    if config_path:
+        config_path = Path(config_path)
+        if not config_path.exists():
+            logger.warning(f"Mermaid config file not found: {config_path}, using default")
+            config_path = None
     
-    # Determine source file name for diagram naming conventions
-    json_name = os.path.basename(json_path)
-    source_name = json_name.replace("slides_", "").replace(".json", "")
+    return json_path, output_dir, config_path, diagram_source_name(json_path)
+
+def diagram_source_name(json_path):
+    """Prefix for diagram file names rendered from json_path (slides_foo.json -> foo)."""
+    return Path(json_path).name.replace("slides_", "").replace(".json", "")
+
+def intern_diagram_content(slides):
+    """Make slides with identical diagram sources share one string object.
     
-    return json_path, output_dir, config_path, source_name
+    Later dedup lookups then hit the identity fast path of string comparison
+    instead of comparing or hashing long sources character by character.
+    """
+    canonical = {}
+    for slide in slides:
+        if isinstance(slide, dict) and isinstance(slide.get("diagram_content"), str):
+            content = slide["diagram_content"]
+            slide["diagram_content"] = canonical.setdefault(content, content)
+    return slides
 
 def load_json_content(json_path):
     """Load JSON content with improved error handling."""
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
+        with open(json_path, 'rb') as f:
             json_content = f.read()
         
         try:
-            data = json.loads(json_content)
+            data = orjson.loads(json_content)
             
             # Check if it's an object with a slides array
             if isinstance(data, dict) and "slides" in data:
-                return data, data["slides"]
+                return data, intern_diagram_content(data["slides"])
             elif isinstance(data, list):
-                return {"slides": data}, data
+                return {"slides": data}, intern_diagram_content(data)
             else:
                 logger.error("Unexpected JSON structure: expected slides array or object with slides key")
                 return None, None
                 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in {json_path}: {e}")
             return None, None
             
@@ -102,18 +435,18 @@ def load_json_content(json_path):
         logger.error(f"Failed to read {json_path}: {e}")
         return None, None
 
+@functools.lru_cache(maxsize=2048)
 def is_valid_mermaid_syntax(src):
     """Check if the diagram content has valid Mermaid syntax structure."""
     # Valid Mermaid diagrams usually start with a diagram type followed by direction
     # e.g., "flowchart TD", "mindmap", "classDiagram", etc.
-    pattern = r'^(flowchart|mindmap|classDiagram|pie|quadrantChart|timeline|sequenceDiagram|stateDiagram-v2|gantt|journey|gitGraph)\s*([A-Z]{2})?'
-    if re.match(pattern, src.strip()):
+    if MERMAID_PREFIX_RE.match(src.lstrip()):
         return True
     
     # Check if it contains any Mermaid-specific syntax
-    mermaid_syntax = ['-->', '-.->', '===>', '-->|', '-.->|', '==>|', '---|', '-.-|', '===|']
-    return any(token in src for token in mermaid_syntax)
+    return any(token in src for token in MERMAID_SYNTAX_TOKENS)
 
+@functools.lru_cache(maxsize=2048)
 def fix_mermaid_syntax(src, diagram_type):
     """Fix common syntax issues in Mermaid diagrams."""
     # If empty or None, create a minimal diagram
@@ -137,7 +470,13 @@ def fix_mermaid_syntax(src, diagram_type):
     return src
 
 def fix_mermaid_with_claude(src, error_msg, client, model):
-    """Use Claude to fix Mermaid syntax errors."""
+    """Use Claude to fix Mermaid syntax errors.
+    
+    client may be a factory such as initialize_claude_client, in which case
+    the client is only created once a fix is actually needed.
+    """
+    if callable(client):
+        client = client()
     if not client:
         return src
         
@@ -182,46 +521,76 @@ Follow these guidelines:
         logger.error(f"Error using Claude to fix Mermaid: {e}")
         return src  # Return original if Claude fails
 
-def render_mermaid(src, output_dir, config_path, base_filename, slide_num, diagram_type, client=None, model=""):
+def _run_checked(cmd, **kwargs):
+    """Run cmd capturing raw output; stderr is decoded only if the command fails."""
+    try:
+        return subprocess.run(cmd, check=True, capture_output=True, **kwargs)
+    except subprocess.CalledProcessError as e:
+        e.stderr = (e.stderr or b"").decode("utf-8", errors="replace")
+        raise
+
+def _run_mmdc(src_bytes, output, config_args):
+    """Render UTF-8 encoded diagram source to output with mmdc via stdin.
+    
+    Mermaid CLI versions that cannot read stdin get a temporary .mmd file
+    instead; this is detected once and remembered for the rest of the run.
+    """
+    global _MMDC_STDIN
+    if _MMDC_STDIN:
+        cmd = [MERMAID_CMD, "-i", "-", "-o", output] + config_args
+        try:
+            return _run_checked(cmd, input=src_bytes)
+        except subprocess.CalledProcessError as e:
+            if "doesn't exist" not in e.stderr:
+                raise
+            logger.info("Mermaid CLI cannot read from stdin, using temporary files")
+            _MMDC_STDIN = False
+    
+    with tempfile.NamedTemporaryFile(suffix='.mmd', delete=False) as f:
+        f.write(src_bytes)
+    try:
+        return _run_checked([MERMAID_CMD, "-i", f.name, "-o", output] + config_args)
+    finally:
+        os.unlink(f.name)
+
+def render_mermaid(src, output_dir, config_path, base_filename, slide_num, diagram_type, client=None, model="",
+                   cache_key=None):
     """Render a Mermaid diagram to image files with comprehensive error handling."""
-    # Create content hash for uniqueness
-    content_hash = hashlib.md5(src.encode()).hexdigest()[:8]
+    # Content-addressed key shared by identical diagrams in any deck
+    cache = get_mermaid_cache()
+    if cache_key is None:
+        cache_key = cache.key(src, config_path)
     
     # Create filenames with consistent naming pattern
     diagram_type_slug = diagram_type.lower().replace(' ', '_')
     output_name = f"{base_filename}_slide{slide_num}_{diagram_type_slug}"
     
-    mmd = os.path.join(output_dir, f"{output_name}.mmd")
-    png = os.path.join(output_dir, f"{output_name}.png")
-    svg = os.path.join(output_dir, f"{output_name}.svg")
+    output_dir = Path(output_dir)
+    png = output_dir / f"{output_name}.png"
+    svg = output_dir / f"{output_name}.svg"
     
-    # Check if files already exist - if so, return them directly
-    if os.path.exists(png) and os.path.stat(png).st_size > 0:
-        logger.info(f"Diagram files already exist for slide {slide_num}, reusing them")
+    # Reuse a previous render of the same source if one is cached
+    if cache.fetch(cache_key, png, svg):
+        logger.info(f"Diagram for slide {slide_num} found in cache, reusing it")
         return png
     
+    # Files left by an earlier run with different source must not be mistaken for this render
+    _unlink(png)
+    _unlink(svg)
+    
     # Validate and fix Mermaid syntax
     if not is_valid_mermaid_syntax(src):
         logger.warning(f"Slide {slide_num}: Invalid Mermaid syntax. Attempting to fix...")
         src = fix_mermaid_syntax(src, diagram_type)
     
-    # Write Mermaid content to file
-    try:
-        with open(mmd, 'w', encoding='utf-8') as f:
-            f.write(src)
-    except Exception as e:
-        logger.error(f"Error writing Mermaid file: {e}")
-        return None
+    # PNG and SVG renders share the optional config arguments
+    have_config = bool(config_path) and os.path.exists(config_path)
+    config_args = ["-c", config_path] if have_config else []
     
-    # Build command with optional config
-    cmd = [MERMAID_CMD, "-i", mmd, "-o", png]
-    if config_path and os.path.exists(config_path):
-        cmd.extend(["-c", config_path])
-    
-    # Also generate SVG with another command
-    svg_cmd = [MERMAID_CMD, "-i", mmd, "-o", svg]
-    if config_path and os.path.exists(config_path):
-        svg_cmd.extend(["-c", config_path])
+    # Placeholder fallback diagrams must not be cached under the original source
+    cacheable = True
+    current_src = src
+    server = get_mermaid_server()
     
     # Execute command with retry and fallback mechanisms
     for attempt in range(3):
@@ -232,9 +601,7 @@ def render_mermaid(src, output_dir, config_path, base_filename, slide_num, diagr
                     # Use Claude to fix syntax
                     new_src = fix_mermaid_with_claude(src, last_error, client, model)
                     if new_src != src:
-                        src = new_src
-                        with open(mmd, 'w', encoding='utf-8') as f:
-                            f.write(src)
+                        src = current_src = new_src
                 elif attempt == 2:
                     # Try with a fallback diagram type
                     fallback_types = DIAGRAM_FALLBACKS.get(diagram_type.lower(), [])
@@ -244,20 +611,44 @@ def render_mermaid(src, output_dir, config_path, base_filename, slide_num, diagr
                         
                         # Create a simplified diagram with the fallback type
                         fallback_src = f"{fallback}\n    A[Start] --> B[End]"
-                        
-                        with open(mmd, 'w', encoding='utf-8') as f:
-                            f.write(fallback_src)
+                        current_src = fallback_src
+                        cacheable = False
             
             logger.info(f"Rendering diagram for slide {slide_num} (attempt {attempt+1}/3)")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            
+            # Encode once for both the PNG and SVG renders
+            src_bytes = current_src.encode('utf-8')
+            if server:
+                try:
+                    server.render_to_file(current_src, png, config_path)
+                except MermaidServerUnavailable as e:
+                    # Server is gone, not the diagram at fault: retry this render with mmdc
+                    disable_mermaid_server(e)
+                    server = None
+            if not server:
+                _run_mmdc(src_bytes, png, config_args)
             
             # Check if PNG was generated successfully
-            if os.path.exists(png) and os.path.stat(png).st_size > 0:
+            if _file_size(png) > 0:
                 # Also try generating SVG
+                svg_ok = False
                 try:
-                    subprocess.run(svg_cmd, check=True, capture_output=True, text=True)
+                    if server:
+                        try:
+                            server.render_to_file(current_src, svg, config_path)
+                        except MermaidServerUnavailable as e:
+                            disable_mermaid_server(e)
+                            server = None
+                    if not server:
+                        _run_mmdc(src_bytes, svg, config_args)
+                    svg_ok = _file_size(svg) > 0
                 except Exception as e:
                     logger.warning(f"SVG generation failed but PNG succeeded: {e}")
+                if not svg_ok:
+                    _unlink(svg)
+                
+                if cacheable:
+                    cache.store(cache_key, png, svg if svg_ok else None)
                 
                 logger.info(f"Successfully rendered diagram for slide {slide_num}")
                 return png
@@ -266,8 +657,9 @@ def render_mermaid(src, output_dir, config_path, base_filename, slide_num, diagr
                 last_error = "Empty output file"
                 time.sleep(1)
                 
-        except subprocess.CalledProcessError as e:
-            last_error = e.stderr if hasattr(e, 'stderr') and e.stderr else str(e)
+        except (subprocess.CalledProcessError, MermaidRenderError) as e:
+            # _run_checked decodes stderr only on this failure path
+            last_error = getattr(e, 'stderr', None) or str(e)
             logger.warning(f"Mermaid CLI error (attempt {attempt+1}/3): {last_error}")
             time.sleep(2)  # Wait before retrying
     
@@ -281,19 +673,16 @@ def render_mermaid(src, output_dir, config_path, base_filename, slide_num, diagr
             f.write(f"Original diagram type: {diagram_type}\n")
             f.write(f"Error: {last_error}\n")
         
-        # Try to create a basic fallback image if possible
-        try:
-            from PIL import Image, ImageDraw, ImageFont
-            
+        # Keep the failing source next to the error for troubleshooting
+        with open(output_dir / f"{output_name}.mmd", 'w', encoding='utf-8') as f:
+            f.write(src)
+        
+        # Create a basic fallback image if possible
+        if HAS_PIL:
             # Create a blank image
             img = Image.new('RGB', (800, 400), color=(255, 255, 255))
             d = ImageDraw.Draw(img)
-            
-            # Try to use a default font
-            try:
-                font = ImageFont.truetype("Arial", 20)
-            except IOError:
-                font = ImageFont.load_default()
+            font = _fallback_font()
             
             # Add error text
             d.text((50, 50), f"Failed to render diagram for slide {slide_num}", fill=(0, 0, 0), font=font)
@@ -304,77 +693,150 @@ def render_mermaid(src, output_dir, config_path, base_filename, slide_num, diagr
             img.save(png)
             logger.info(f"Created fallback image for slide {slide_num}")
             return png
-            
-        except ImportError:
-            # If PIL is not available, create a minimal PNG
-            with open(png, 'wb') as f:
-                # Minimal transparent PNG
-                f.write(bytes.fromhex(
-                    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c4"
-                    "890000000d4944415478da6364f8ffbf0600050001e36172eb0000000049454e44ae426082"
-                ))
-            logger.info(f"Created minimal fallback image for slide {slide_num}")
-            return png
+        
+        # If PIL is not available, create a minimal PNG
+        with open(png, 'wb') as f:
+            f.write(MINIMAL_PNG)
+        logger.info(f"Created minimal fallback image for slide {slide_num}")
+        return png
     except Exception as e:
         logger.error(f"Failed to create fallback image: {e}")
         
         # If absolutely everything fails, return None
         return None
 
+def _render_in_slot(*args):
+    """Call render_mermaid while holding one of the process-wide render slots."""
+    with _RENDER_SLOTS:
+        return render_mermaid(*args)
+
+def render_mermaid_batch(diagrams, config_path):
+    """Render several diagrams into the cache with one mmdc run per format.
+    
+    Each mmdc invocation pays the Node/Chromium startup cost, so cache misses
+    are wrapped as fenced blocks in a single markdown file and rendered by one
+    browser instance. Diagrams that fail here are left for render_mermaid,
+    which retries them individually.
+    
+    Args:
+        diagrams: List of (cache_key, src, diagram_type) tuples
+        config_path: Optional Mermaid config file
+        
+    Returns:
+        Number of diagrams added to the cache
+    """
+    cache = get_mermaid_cache()
+    sources = []
+    for _, src, diagram_type in diagrams:
+        if not is_valid_mermaid_syntax(src):
+            src = fix_mermaid_syntax(src, diagram_type)
+        sources.append(src)
+    
+    config_args = ["-c", config_path] if config_path and os.path.exists(config_path) else []
+    
+    with tempfile.TemporaryDirectory(dir=cache.cache_dir) as tmp_dir:
+        combined = os.path.join(tmp_dir, "combined.md")
+        with open(combined, 'w', encoding='utf-8') as f:
+            f.write("\n\n".join(f"```mermaid\n{src}\n```" for src in sources))
+        
+        # mmdc writes the n-th diagram of combined.md to out-<n>.<format>
+        out = os.path.join(tmp_dir, "out.md")
+        for fmt in ("png", "svg"):
+            cmd = [MERMAID_CMD, "-i", combined, "-o", out, "-e", fmt] + config_args
+            try:
+                _run_checked(cmd)
+            except (subprocess.CalledProcessError, FileNotFoundError) as e:
+                logger.warning(f"Batch {fmt} rendering failed, falling back to per-diagram rendering: {e}")
+                if fmt == "png":
+                    return 0
+        
+        rendered = 0
+        for index, (cache_key, _, _) in enumerate(diagrams, 1):
+            png = os.path.join(tmp_dir, f"out-{index}.png")
+            if _file_size(png) > 0:
+                cache.store(cache_key, png, os.path.join(tmp_dir, f"out-{index}.svg"))
+                rendered += 1
+    
+    logger.info(f"Batch rendered {rendered} of {len(diagrams)} diagrams")
+    return rendered
+
 def process_slides(slides, output_dir, config_path, source_name, client, model):
     """Process all slides to find and render diagrams."""
     changes = 0
-    processed_hashes = {}  # Track already processed diagrams to avoid duplicates
+    cache = get_mermaid_cache()
+    processed_diagrams = {}  # Group slides sharing a diagram so each one renders once
     
     for slide in slides:
         if not isinstance(slide, dict):
             continue
-            
-        slide_num = slide.get("slide_number", 0)
         
-        # Process diagrams
-        if slide.get("diagram_type") and slide.get("diagram_content"):
+        # Skip slides without diagrams or with null content
+        diagram_content = slide.get("diagram_content")
+        if not slide.get("diagram_type") or not diagram_content or diagram_content == "null":
+            continue
+        
+        # Sources are interned on load, so equal diagrams compare by identity
+        processed_diagrams.setdefault(diagram_content, []).append(slide)
+    
+    # Only distinct sources are hashed, for the on-disk cache
+    groups = [(cache.key(content, config_path), group) for content, group in processed_diagrams.items()]
+    
+    # Render every uncached diagram in one batch before the per-slide pass
+    misses = [
+        (cache_key, group[0]["diagram_content"], group[0]["diagram_type"])
+        for cache_key, group in groups
+        if not (cache.cache_dir / f"{cache_key}.png").exists()
+    ]
+    if len(misses) > 1 and get_mermaid_server() is None:
+        with _RENDER_SLOTS:
+            render_mermaid_batch(misses, config_path)
+    
+    # Image paths in the JSON are relative to the directory holding the images folder
+    output_dir = Path(output_dir)
+    output_parent = output_dir.parent
+    
+    # Render the remaining diagrams concurrently; mmdc runs release the GIL
+    with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as executor:
+        futures = {}
+        for cache_key, group in groups:
+            slide = group[0]
+            slide_num = slide.get("slide_number", 0)
+            logger.info(f"Processing diagram for slide {slide_num} ({slide['diagram_type']})")
+            future = executor.submit(
+                _render_in_slot,
+                slide["diagram_content"],
+                output_dir,
+                config_path,
+                source_name,
+                slide_num,
+                slide["diagram_type"],
+                client,
+                model,
+                cache_key
+            )
+            futures[future] = group
+        
+        for future in as_completed(futures):
+            group = futures[future]
+            slide_num = group[0].get("slide_number", 0)
             try:
-                diagram_type = slide.get("diagram_type")
-                diagram_content = slide.get("diagram_content")
-                
-                # Skip if this is null content
-                if not diagram_content or diagram_content == "null":
-                    continue
-                    
-                # Skip if we've already processed this exact content
-                content_hash = hashlib.md5(diagram_content.encode()).hexdigest()
-                if content_hash in processed_hashes:
-                    slide["image_url"] = processed_hashes[content_hash]
-                    changes += 1
-                    logger.info(f"Slide {slide_num}: Reusing previously generated diagram")
-                    continue
-                
-                # Render the diagram
-                logger.info(f"Processing diagram for slide {slide_num} ({diagram_type})")
-                img_path = render_mermaid(
-                    diagram_content, 
-                    output_dir, 
-                    config_path, 
-                    source_name, 
-                    slide_num,
-                    diagram_type,
-                    client,
-                    model
-                )
-                
-                if img_path:
-                    # Update the slide with the image path
-                    rel_path = os.path.relpath(img_path, os.path.dirname(output_dir))
-                    slide["image_url"] = rel_path
-                    processed_hashes[content_hash] = rel_path
-                    changes += 1
-                    logger.info(f"Slide {slide_num}: Added image path {rel_path}")
-                else:
-                    logger.error(f"Slide {slide_num}: Failed to generate diagram")
-                    
+                img_path = future.result()
             except Exception as e:
                 logger.error(f"Error processing diagram for slide {slide_num}: {e}")
+                continue
+            
+            if not img_path:
+                logger.error(f"Slide {slide_num}: Failed to generate diagram")
+                continue
+            
+            # Update every slide showing this diagram with the image path
+            rel_path = str(Path(img_path).relative_to(output_parent))
+            for slide in group:
+                slide["image_url"] = rel_path
+                changes += 1
+            logger.info(f"Slide {slide_num}: Added image path {rel_path}")
+            if len(group) > 1:
+                logger.info(f"Reused diagram from slide {slide_num} on {len(group) - 1} other slides")
     
     return changes
 
@@ -382,8 +844,8 @@ def save_updated_json(json_path, data, changes):
     """Save the updated JSON data back to file."""
     if changes > 0:
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             logger.info(f"Updated JSON file with {changes} changes: {json_path}")
             return True
         except Exception as e:
@@ -393,12 +855,16 @@ def save_updated_json(json_path, data, changes):
         logger.info("No changes to save")
         return True
 
-def process_json_file(json_path, output_dir, config_path, client, model):
-    """Process a single JSON file and render all diagrams."""
+def process_json_file(json_path, output_dir, config_path, client, model, source_name=None):
+    """Process a single JSON file and render all diagrams.
+    
+    source_name overrides the prefix used for diagram file names.
+    """
     # Validate and normalize paths
-    json_path, output_dir, config_path, source_name = validate_paths(json_path, output_dir, config_path)
+    json_path, output_dir, config_path, default_name = validate_paths(json_path, output_dir, config_path)
     if not json_path:
         return False
+    source_name = source_name or default_name
         
     # Load JSON data
     data, slides = load_json_content(json_path)
@@ -413,36 +879,60 @@ def process_json_file(json_path, output_dir, config_path, client, model):
 
 def process_directory(dir_path, output_dir, config_path, client, model):
     """Process all JSON files in a directory."""
-    # Find all JSON files
-    json_files = [f for f in os.listdir(dir_path) if f.endswith('.json')]
+    # Find all JSON files; DirEntry.is_file() reuses the type from readdir
+    with os.scandir(dir_path) as entries:
+        json_files = [entry.path for entry in entries if entry.name.endswith('.json') and entry.is_file()]
     if not json_files:
         logger.error(f"No JSON files found in {dir_path}")
         return False
         
     logger.info(f"Found {len(json_files)} JSON files to process")
     
-    success = True
-    for json_file in json_files:
-        json_path = os.path.join(dir_path, json_file)
-        
-        # Create subdirectory for each file if needed
-        if output_dir:
-            file_output_dir = output_dir
+    # Diagram names are prefixed per file, so files can share an output directory.
+    # slides_a.json and a.json would both use "a"; such files fall back to their full stem.
+    by_name = {}
+    for json_path in json_files:
+        by_name.setdefault(diagram_source_name(json_path), []).append(json_path)
+    source_names = {}
+    for name, paths in by_name.items():
+        if len(paths) > 1:
+            logger.warning(f"{', '.join(sorted(os.path.basename(p) for p in paths))} would overwrite "
+                           f"each other's diagrams as '{name}'; naming them by full file name instead")
+            for json_path in paths:
+                source_names[json_path] = Path(json_path).stem
         else:
-            file_output_dir = os.path.join(dir_path, "images")
-            
-        # Process the file
-        file_success = process_json_file(json_path, file_output_dir, config_path, client, model)
-        if not file_success:
-            success = False
-            
-    return success
+            source_names[paths[0]] = name
+    if len(set(source_names.values())) < len(source_names):
+        logger.error(f"Diagram file names in {dir_path} collide; rename the JSON files and retry")
+        return False
+    
+    file_output_dir = output_dir or os.path.join(dir_path, "images")
+    
+    # Set up shared renderer state before worker threads race to create it
+    get_mermaid_cache()
+    get_mmdc_version()
+    get_mermaid_server()
+    
+    # Files run in parallel, but renders across all of them share the _RENDER_SLOTS limit
+    with ThreadPoolExecutor(max_workers=min(len(json_files), RENDER_WORKERS)) as executor:
+        results = executor.map(
+            lambda json_path: process_json_file(json_path, file_output_dir, config_path, client, model,
+                                                source_names[json_path]),
+            json_files
+        )
+        return all(list(results))
 
+@functools.lru_cache(maxsize=None)
 def initialize_claude_client():
-    """Initialize the Claude client for syntax fixing if API key is available."""
+    """Initialize the Claude client for syntax fixing if API key is available.
+    
+    The anthropic import and client setup are deferred to the first call and
+    the result is memoized, so runs where every diagram renders never pay for it.
+    """
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if api_key:
         try:
+            import anthropic
             client = anthropic.Anthropic(api_key=api_key)
             logger.info("Initialized Claude client for diagram fixing")
             return client
@@ -462,12 +952,17 @@ def main():
     parser.add_argument("--model", default="claude-3-7-sonnet-20250219", help="Claude model to use for fixing diagrams")
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     parser.add_argument("--check-cmd", action="store_true", help="Check if Mermaid CLI is installed")
+    parser.add_argument("--mermaid-server", action="store_true",
+                        help="Render through one persistent browser (needs node and a global mermaid-cli install)")
     
     args = parser.parse_args()
     
     # Configure logging
     logger.setLevel(getattr(logging, args.log_level))
     
+    global USE_MERMAID_SERVER
+    USE_MERMAID_SERVER = args.mermaid_server
+    
     # Check if Mermaid CLI is installed
     if args.check_cmd:
         try:
@@ -478,8 +973,8 @@ def main():
             logger.info("Install with: npm install -g @mermaid-js/mermaid-cli")
             sys.exit(1)
     
-    # Initialize Claude client if API key is available
-    client = initialize_claude_client()
+    # Claude client is created lazily, only if a diagram needs fixing
+    client = initialize_claude_client
     
     # Process files
     input_path = args.json
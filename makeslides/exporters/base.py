@@ -5,12 +5,55 @@ Base class for presentation exporters.
 All exporters should inherit from BaseExporter and implement the export() method.
 """
 from abc import ABC, abstractmethod
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Runs of whitespace collapsed by _sanitize_content
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Normalized layout names, keyed by lowercased slide layout
+_LAYOUT_MAP = {
+    'title': 'title',
+    'title_slide': 'title',
+    'section_header': 'section',
+    'section': 'section',
+    'title_and_body': 'content',
+    'content': 'content',
+    'title_and_two_columns': 'two_columns',
+    'two_columns': 'two_columns',
+    'columns': 'two_columns',
+    'two-column': 'two_columns',
+    'quote': 'quote',
+    'main_point': 'main_point',
+    'big_number': 'big_number',
+    'caption': 'caption',
+    'blank': 'blank'
+}
+
+# Leading bullet marker ("* ", "- " or "• ") on each line of slide content
+_BULLET_RE = re.compile(r'^[^\S\n]*[*•-] ', re.MULTILINE)
+
+
+@lru_cache(maxsize=256)
+def _layout_type(layout: str) -> str:
+    """Normalized layout type for a raw layout name, memoized across slides."""
+    return _LAYOUT_MAP.get(layout.lower(), 'content')
+
+
+@lru_cache(maxsize=1024)
+def _bullet_points(content: str) -> Tuple[str, ...]:
+    """Bullet texts parsed from content, memoized by the content itself."""
+    # Remove bullet markers, then skip empty lines
+    return tuple(
+        stripped for line in _BULLET_RE.sub('', content).split('\n')
+        if (stripped := line.strip())
+    )
+
 
 class BaseExporter(ABC):
     """Abstract base class for presentation exporters."""
@@ -25,10 +68,10 @@ class BaseExporter(ABC):
         """
         self.slides_data = slides_data
         self.output_path = output_path
-        self.metadata = self._extract_metadata()
 
-    def _extract_metadata(self) -> Dict[str, Any]:
-        """Extract presentation metadata from slides."""
+    @cached_property
+    def metadata(self) -> Dict[str, Any]:
+        """Presentation metadata extracted from the slides on first access."""
         if not self.slides_data:
             return {}
 
@@ -94,9 +137,7 @@ class BaseExporter(ABC):
             return ""
 
         # Remove extra whitespace
-        content = ' '.join(content.split())
-
-        return content
+        return _WHITESPACE_RE.sub(' ', content).strip()
 
     def _get_layout_type(self, slide: Dict[str, Any]) -> str:
         """
@@ -108,34 +149,7 @@ class BaseExporter(ABC):
         Returns:
             Layout type string
         """
-        layout = slide.get('layout', 'TITLE_AND_BODY')
-
-        # Normalize layout names
-        layout_map = {
-            'TITLE': 'title',
-            'TITLE_SLIDE': 'title',
-            'title': 'title',
-            'SECTION_HEADER': 'section',
-            'section': 'section',
-            'TITLE_AND_BODY': 'content',
-            'content': 'content',
-            'TITLE_AND_TWO_COLUMNS': 'two_columns',
-            'TWO_COLUMNS': 'two_columns',
-            'columns': 'two_columns',
-            'two-column': 'two_columns',
-            'QUOTE': 'quote',
-            'quote': 'quote',
-            'MAIN_POINT': 'main_point',
-            'main_point': 'main_point',
-            'BIG_NUMBER': 'big_number',
-            'big_number': 'big_number',
-            'CAPTION': 'caption',
-            'caption': 'caption',
-            'BLANK': 'blank',
-            'blank': 'blank'
-        }
-
-        return layout_map.get(layout, 'content')
+        return _layout_type(str(slide.get('layout', 'TITLE_AND_BODY')))
 
     def _format_bullet_points(self, content: str) -> List[str]:
         """
@@ -150,25 +164,7 @@ class BaseExporter(ABC):
         if not content:
             return []
 
-        lines = content.split('\n')
-        bullets = []
-
-        for line in lines:
-            line = line.strip()
-
-            # Skip empty lines
-            if not line:
-                continue
-
-            # Remove bullet markers
-            if line.startswith('* ') or line.startswith('- '):
-                line = line[2:]
-            elif line.startswith('• '):
-                line = line[2:]
-
-            bullets.append(line.strip())
-
-        return bullets
+        return list(_bullet_points(content))
 
     def __str__(self) -> str:
         """String representation."""
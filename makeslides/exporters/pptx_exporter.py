@@ -5,19 +5,28 @@ PowerPoint (PPTX) exporter using python-pptx.
 Creates professional PowerPoint presentations with full control over layouts,
 images can be embedded directly (no external hosting needed).
 """
+import copy
+import hashlib
 import io
 import logging
-import requests
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, NamedTuple, Optional, Sequence, Tuple, Union
 from urllib.parse import urlparse
+from lxml import etree
+from PIL import Image, UnidentifiedImageError
 
 try:
+    import pptx
     from pptx import Presentation
-    from pptx.util import Inches, Pt
+    from pptx.util import Emu, Inches, Pt
     from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
-    from pptx.enum.shapes import MSO_SHAPE
     from pptx.dml.color import RGBColor
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.oxml.ns import qn
+    from pptx.oxml.shapes.autoshape import CT_Shape
 except ImportError:
     raise ImportError("python-pptx is required for PPTX export. Install with: pip install python-pptx")
 
@@ -25,6 +34,134 @@ from .base import BaseExporter
 
 logger = logging.getLogger(__name__)
 
+# Downloaded slide images shared across exports, keyed by sha256 of the URL
+IMAGE_CACHE_DIR = Path.home() / ".cache" / "makeslides" / "images"
+
+# Least recently used images are pruned once the cache grows past this size
+IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+# python-pptx's built-in default template, read once and opened from memory per export
+_TEMPLATE_BYTES = (Path(pptx.__file__).parent / 'templates' / 'default.pptx').read_bytes()
+
+
+_A_P = qn('a:p')
+_A_PPR = qn('a:pPr')
+_A_DEFRPR = qn('a:defRPr')
+_A_R = qn('a:r')
+_A_T = qn('a:t')
+_A_SOLIDFILL = qn('a:solidFill')
+
+
+def _append_paragraphs(text_frame, items: Sequence[str], size: Pt) -> None:
+    """
+    Append one sized paragraph per item to a text frame.
+
+    Builds the ``<a:p>`` elements directly under the frame's ``txBody`` instead of
+    going through python-pptx's paragraph, run and font proxies for every line.
+    The resulting XML is the same as ``add_paragraph()`` + ``text`` + ``font.size``.
+
+    Args:
+        text_frame: python-pptx TextFrame to append to
+        items: Paragraph texts, in order
+        size: Font size applied to each paragraph
+    """
+    txBody = text_frame._txBody
+    SubElement = etree.SubElement
+    sz = str(size.centipoints)
+
+    for text in items:
+        p = SubElement(txBody, _A_P)
+        SubElement(SubElement(p, _A_PPR), _A_DEFRPR, sz=sz)
+        if not text:
+            continue
+        try:
+            SubElement(SubElement(p, _A_R), _A_T).text = text
+        except ValueError:
+            # Control characters need python-pptx's escaping
+            txBody.remove(p)
+            paragraph = text_frame.add_paragraph()
+            paragraph.text = text
+            paragraph.font.size = size
+
+
+def _solid_rect_template():
+    """Build a borderless, solid-filled rectangle <p:sp> to copy for each section bar."""
+    sp = CT_Shape.new_autoshape_sp(0, '', 'rect', 0, 0, 0, 0)
+    spPr = sp.spPr
+    etree.SubElement(etree.SubElement(spPr, qn('a:solidFill')), qn('a:srgbClr'))
+    etree.SubElement(etree.SubElement(spPr, qn('a:ln')), qn('a:noFill'))
+    return sp
+
+
+_SOLID_RECT_SP = _solid_rect_template()
+
+
+def _add_solid_rect(shapes, box: Tuple[int, int, int, int], color: RGBColor) -> None:
+    """
+    Append a borderless rectangle filled with color to a slide's shape tree.
+
+    Produces the same XML as add_shape(MSO_SHAPE.RECTANGLE, ...) followed by
+    fill.solid(), fill.fore_color.rgb and line.fill.background(), but as one
+    copied subtree instead of a series of proxy mutations.
+
+    Args:
+        shapes: SlideShapes to add the rectangle to
+        box: (left, top, width, height) of the rectangle
+        color: Fill color
+    """
+    sp = copy.deepcopy(_SOLID_RECT_SP)
+    id_ = shapes._next_shape_id
+    cNvPr = sp.nvSpPr.cNvPr
+    cNvPr.id = id_
+    cNvPr.name = f'Rectangle {id_ - 1}'
+
+    spPr = sp.spPr
+    xfrm = spPr.xfrm
+    xfrm.off.x, xfrm.off.y, xfrm.ext.cx, xfrm.ext.cy = box
+    spPr.find(_A_SOLIDFILL)[0].set('val', str(color))
+
+    shapes._spTree.insert_element_before(sp, 'p:extLst')
+
+
+def _downscale_image(path: Path, max_size: Tuple[int, int]) -> Union[str, bytes]:
+    """
+    Shrink an image file to fit within max_size pixels.
+
+    Kept at module level so it can run in a worker process.
+
+    Args:
+        path: Image file
+        max_size: Maximum (width, height) in pixels
+
+    Returns:
+        Encoded image bytes, or the original path if no resize is needed
+    """
+    try:
+        with Image.open(path) as img:
+            if img.width <= max_size[0] and img.height <= max_size[1]:
+                return str(path)
+            has_alpha = img.mode in ('RGBA', 'LA') or 'transparency' in img.info
+            img.thumbnail(max_size, Image.LANCZOS)
+            out = io.BytesIO()
+            if has_alpha:
+                img.save(out, 'PNG', optimize=True)
+            else:
+                img.convert('RGB').save(out, 'JPEG', quality=85, optimize=True)
+            return out.getvalue()
+    except (UnidentifiedImageError, OSError) as e:
+        logger.debug(f"Embedding {path} without resizing: {e}")
+        return str(path)
+
+
+class SlideSpec(NamedTuple):
+    """Slide fields resolved once from the input dict before slides are built."""
+    layout: str
+    title: Any
+    content: Any
+    bullets: Tuple[str, ...]
+    image_url: Any
+
 
 class PPTXExporter(BaseExporter):
     """Export presentations to PowerPoint (PPTX) format."""
@@ -38,6 +175,43 @@ class PPTXExporter(BaseExporter):
     SECONDARY_COLOR = RGBColor(51, 51, 51)  # Dark gray
     ACCENT_COLOR = RGBColor(255, 185, 0)  # Orange
 
+    # Font sizes, converted to EMU once at import
+    _PT_16 = Pt(16)
+    _PT_18 = Pt(18)
+    _PT_20 = Pt(20)
+    _PT_24 = Pt(24)
+    _PT_32 = Pt(32)
+    _PT_44 = Pt(44)
+    _PT_54 = Pt(54)
+    _PT_60 = Pt(60)
+    _PT_88 = Pt(88)
+
+    # Shape boxes as (left, top, width, height), converted to EMU once at import
+    _SECTION_BAR_BOX = (Inches(0), Inches(6.8), Inches(10), Inches(0.7))
+    _LEFT_COLUMN_BOX = (Inches(0.5), Inches(1.5), Inches(4.5), Inches(5))
+    _RIGHT_COLUMN_BOX = (Inches(5.2), Inches(1.5), Inches(4.5), Inches(5))
+    _QUOTE_BOX = (Inches(1), Inches(2.5), Inches(8), Inches(2))
+    _ATTRIBUTION_BOX = (Inches(1), Inches(5), Inches(8), Inches(1))
+    _MAIN_POINT_BOX = (Inches(0.5), Inches(2), Inches(9), Inches(3))
+    _SUPPORTING_TEXT_BOX = (Inches(0.5), Inches(5.5), Inches(9), Inches(1.5))
+    _BIG_NUMBER_BOX = (Inches(0.5), Inches(1.5), Inches(9), Inches(2.5))
+    _NUMBER_DESCRIPTION_BOX = (Inches(0.5), Inches(4.5), Inches(9), Inches(2))
+    _CAPTION_IMAGE_BOX = (Inches(1), Inches(0.5), Inches(8), Inches(5.5))
+    _CAPTION_BOX = (Inches(1), Inches(6.2), Inches(8), Inches(1))
+    _DEFAULT_IMAGE_BOX = (Inches(6), Inches(4), Inches(3.5), Inches(2.5))
+
+    # Concurrent downloads when prefetching remote images
+    IMAGE_FETCH_WORKERS = 16
+
+    # Resolution remote images are downscaled to for their on-slide size
+    IMAGE_DPI = 150
+
+    # Separate connect/read timeouts (seconds) for image downloads
+    IMAGE_TIMEOUT = (3, 10)
+
+    # Decks longer than this resize their images in worker processes up front
+    PARALLEL_IMAGE_SLIDES = 50
+
     def __init__(self, slides_data: List[Dict[str, Any]], output_path: Optional[Path] = None,
                  theme: str = "modern"):
         """
@@ -49,11 +223,69 @@ class PPTXExporter(BaseExporter):
             theme: Theme name (modern, classic, minimal)
         """
         super().__init__(slides_data, output_path)
-        self.prs = Presentation()
+        self.prs = Presentation(io.BytesIO(_TEMPLATE_BYTES))
         self.prs.slide_width = self.SLIDE_WIDTH
         self.prs.slide_height = self.SLIDE_HEIGHT
         self.theme = theme
 
+        # Resolve slide layouts once instead of walking slide_layouts per slide
+        layouts = self.prs.slide_layouts
+        self._layout_title = layouts[0]
+        self._layout_content = layouts[1]
+        self._layout_section = layouts[2]
+        self._layout_blank = layouts[6]
+        self._add_slide = self.prs.slides.add_slide
+
+        # Map layout types to creation methods
+        self._layout_methods = {
+            'title': self._create_title_slide,
+            'section': self._create_section_slide,
+            'content': self._create_content_slide,
+            'two_columns': self._create_two_column_slide,
+            'quote': self._create_quote_slide,
+            'main_point': self._create_main_point_slide,
+            'big_number': self._create_big_number_slide,
+            'caption': self._create_caption_slide,
+            'blank': self._create_blank_slide
+        }
+
+        # Cached image files keyed by URL, filled by _prefetch_images()
+        self._image_cache: Dict[str, Path] = {}
+
+        # Embedded image parts keyed by sha256 of their bytes, shared by every slide showing them
+        self._image_parts: Dict[bytes, Any] = {}
+
+        # Downscaled images keyed by (cached file, width, height)
+        self._prepared_images: Dict[Tuple[Path, int, int], Union[str, bytes]] = {}
+
+        # Download session, created by _http_session() when a remote image is first needed
+        self._session = None
+
+    def close(self):
+        """Release pooled HTTP connections."""
+        if self._session is not None:
+            self._session.close()
+
+    def _http_session(self):
+        """
+        Return the keep-alive session used for all image downloads.
+
+        One session means TLS handshakes are paid per host, not per image.
+        requests is imported here so decks without remote images never load it.
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                                  max_retries=Retry(total=2, backoff_factor=0.3))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+
     def export(self) -> Path:
         """
         Export presentation to PPTX file.
@@ -64,312 +296,386 @@ class PPTXExporter(BaseExporter):
         if not self.validate_slides():
             raise ValueError("Invalid slides data")
 
-        logger.info(f"Exporting {len(self.slides_data)} slides to PPTX...")
+        self._specs = [self._to_spec(slide_data) for slide_data in self.slides_data]
 
-        for i, slide_data in enumerate(self.slides_data, 1):
-            logger.info(f"Creating slide {i}/{len(self.slides_data)}: {slide_data.get('title', 'Untitled')}")
-            self._create_slide(slide_data)
+        self._prefetch_images()
+        if len(self.slides_data) > self.PARALLEL_IMAGE_SLIDES:
+            self._prepare_images_parallel()
+
+        # Per-slide progress is only formatted when INFO logging is on
+        log_progress = logger.isEnabledFor(logging.INFO)
+        total = len(self._specs)
+        for i, spec in enumerate(self._specs, 1):
+            if log_progress:
+                logger.info("Creating slide %d/%d: %s", i, total, spec.title or 'Untitled')
+            self._create_slide(spec)
 
         # Determine output path
         if not self.output_path:
             title_slug = self.metadata['title'].lower().replace(' ', '_')
             self.output_path = Path(f"{title_slug}.pptx")
 
-        # Save presentation
-        self.prs.save(str(self.output_path))
+        # Save presentation to memory, then write the file in one go
+        buffer = io.BytesIO()
+        self.prs.save(buffer)
+        self.output_path = Path(self.output_path)
+        self.output_path.write_bytes(buffer.getbuffer())
         logger.info(f"✅ PPTX presentation saved to: {self.output_path}")
 
         return self.output_path
 
-    def _create_slide(self, slide_data: Dict[str, Any]):
-        """Create a slide based on its layout type."""
-        layout_type = self._get_layout_type(slide_data)
+    def _to_spec(self, slide_data: Dict[str, Any]) -> SlideSpec:
+        """
+        Resolve the fields the slide builders read from a slide dictionary.
 
-        # Map layout types to creation methods
-        layout_methods = {
-            'title': self._create_title_slide,
-            'section': self._create_section_slide,
-            'content': self._create_content_slide,
-            'two_columns': self._create_two_column_slide,
-            'quote': self._create_quote_slide,
-            'main_point': self._create_main_point_slide,
-            'big_number': self._create_big_number_slide,
-            'caption': self._create_caption_slide,
-            'blank': self._create_blank_slide
-        }
+        Bullet points are only parsed for the layouts that show them.
 
-        method = layout_methods.get(layout_type, self._create_content_slide)
-        method(slide_data)
+        Args:
+            slide_data: Slide dictionary
+
+        Returns:
+            SlideSpec for the slide
+        """
+        get = slide_data.get
+        layout = self._get_layout_type(slide_data)
+        content = get('content', '')
+        bullets = tuple(self._format_bullet_points(content)) if layout in ('content', 'two_columns') else ()
+        return SlideSpec(layout, get('title', ''), content, bullets, get('image_url'))
+
+    def _prefetch_images(self):
+        """Download every remote image in the deck concurrently into the image cache."""
+        urls = list(dict.fromkeys(
+            spec.image_url for spec in self._specs
+            if isinstance(spec.image_url, str)
+            and spec.image_url.startswith(('http://', 'https://'))
+        ))
+        if not urls:
+            return
+
+        logger.info(f"Prefetching {len(urls)} remote images...")
+        self._http_session()  # created up front rather than racing in the workers
+        IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=min(len(urls), self.IMAGE_FETCH_WORKERS)) as executor:
+            for url, path in zip(urls, executor.map(self._fetch_image, urls)):
+                if path is not None:
+                    self._image_cache[url] = path
+
+        self._prune_image_cache()
+
+    def _prepare_images_parallel(self):
+        """Downscale every prefetched image in the deck across worker processes."""
+        keys = set()
+        for spec in self._specs:
+            url = spec.image_url
+            path = self._image_cache.get(url) if isinstance(url, str) else None
+            size = self._image_display_size(spec) if path is not None else None
+            if size is not None:
+                keys.add((path, *size))
+        keys = [key for key in keys if key not in self._prepared_images]
+        if len(keys) < 2:
+            return
+
+        max_sizes = [self._pixel_size(width, height) for _, width, height in keys]
+        logger.info(f"Resizing {len(keys)} images in parallel...")
+        try:
+            with ProcessPoolExecutor(max_workers=min(len(keys), os.cpu_count() or 1)) as executor:
+                for key, prepared in zip(keys, executor.map(_downscale_image, [k[0] for k in keys], max_sizes)):
+                    self._prepared_images[key] = prepared
+        except (OSError, RuntimeError) as e:
+            # Anything left is resized lazily while its slide is built
+            logger.warning(f"Parallel image resizing failed: {e}")
+
+    def _image_display_size(self, spec: SlideSpec) -> Optional[Tuple[int, int]]:
+        """
+        Return the (width, height) a slide's image will be placed at.
+
+        Mirrors the boxes passed to _add_image_to_slide by the _create_* methods.
+
+        Returns:
+            Size in EMU, or None if the slide's layout shows no image
+        """
+        layout_type = spec.layout
+        if layout_type == 'two_columns':
+            if 'diagram' in spec.image_url.lower():
+                return None
+            box = self._RIGHT_COLUMN_BOX
+        elif layout_type == 'caption':
+            box = self._CAPTION_IMAGE_BOX
+        elif layout_type == 'blank':
+            return self.SLIDE_WIDTH, self.SLIDE_HEIGHT
+        elif layout_type in self._layout_methods and layout_type != 'content':
+            return None
+        else:
+            box = self._DEFAULT_IMAGE_BOX
+        return box[2], box[3]
+
+    def _fetch_image(self, url: str) -> Optional[Path]:
+        """
+        Fetch an image into the on-disk cache for prefetching.
+
+        Returns:
+            Cached file path, or None if the download failed (retried when the slide is built)
+        """
+        try:
+            return self._get_cached_image(url)
+        except OSError as e:  # includes requests.RequestException
+            logger.debug(f"Prefetch failed for {url}: {e}")
+            return None
+
+    def _get_cached_image(self, url: str) -> Path:
+        """
+        Return the cached file for an image URL, downloading it on a miss.
+
+        Downloads are written to a temporary file and renamed into place, so
+        concurrent exports never see a partial image.
+
+        Raises:
+            requests.RequestException: If the download fails
+        """
+        path = IMAGE_CACHE_DIR / f"{hashlib.sha256(url.encode()).hexdigest()}.bin"
+        try:
+            # Refresh the modification time so pruning evicts least recently used images
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        logger.info(f"Downloading image from {url}")
+        response = self._http_session().get(url, timeout=self.IMAGE_TIMEOUT)
+        response.raise_for_status()
+
+        IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=IMAGE_CACHE_DIR, delete=False) as tmp:
+            tmp.write(response.content)
+        os.replace(tmp.name, path)
+        return path
+
+    def _prune_image_cache(self):
+        """Delete least recently used cached images beyond IMAGE_CACHE_MAX_BYTES."""
+        with os.scandir(IMAGE_CACHE_DIR) as it:
+            entries = [(entry.stat(), entry.path) for entry in it if entry.name.endswith('.bin')]
+
+        total = sum(st.st_size for st, _ in entries)
+        if total <= IMAGE_CACHE_MAX_BYTES:
+            return
+
+        for st, path in sorted(entries, key=lambda item: item[0].st_mtime):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= st.st_size
+            if total <= IMAGE_CACHE_MAX_BYTES:
+                break
 
-    def _create_title_slide(self, slide_data: Dict[str, Any]):
+    def _create_slide(self, spec: SlideSpec):
+        """Create a slide based on its layout type."""
+        layout_type = spec.layout
+
+        method = self._layout_methods.get(layout_type, self._create_content_slide)
+        method(spec)
+
+    def _create_title_slide(self, spec: SlideSpec):
         """Create a title slide."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[0])
+        slide = self._add_slide(self._layout_title)
 
         title = slide.shapes.title
         subtitle = slide.placeholders[1]
 
-        title.text = slide_data.get('title', '')
-        subtitle.text = slide_data.get('content', '')
+        title.text = spec.title
+        subtitle.text = spec.content
 
         # Style title
-        title.text_frame.paragraphs[0].font.size = Pt(44)
+        title.text_frame.paragraphs[0].font.size = self._PT_44
         title.text_frame.paragraphs[0].font.bold = True
         title.text_frame.paragraphs[0].font.color.rgb = self.PRIMARY_COLOR
 
         # Style subtitle
-        subtitle.text_frame.paragraphs[0].font.size = Pt(24)
+        subtitle.text_frame.paragraphs[0].font.size = self._PT_24
         subtitle.text_frame.paragraphs[0].font.color.rgb = self.SECONDARY_COLOR
 
-    def _create_section_slide(self, slide_data: Dict[str, Any]):
+    def _create_section_slide(self, spec: SlideSpec):
         """Create a section header slide."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[2])  # Section header layout
+        slide = self._add_slide(self._layout_section)  # Section header layout
 
         title = slide.shapes.title
-        title.text = slide_data.get('title', '')
+        title.text = spec.title
 
         # Style as large, centered text
-        title.text_frame.paragraphs[0].font.size = Pt(54)
+        title.text_frame.paragraphs[0].font.size = self._PT_54
         title.text_frame.paragraphs[0].font.bold = True
         title.text_frame.paragraphs[0].font.color.rgb = self.PRIMARY_COLOR
         title.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
 
         # Add colored bar at bottom for visual interest
-        left = Inches(0)
-        top = Inches(6.8)
-        width = Inches(10)
-        height = Inches(0.7)
-
-        bar = slide.shapes.add_shape(
-            MSO_SHAPE.RECTANGLE,
-            left, top, width, height
-        )
-        bar.fill.solid()
-        bar.fill.fore_color.rgb = self.ACCENT_COLOR
-        bar.line.fill.background()
-
-    def _create_content_slide(self, slide_data: Dict[str, Any]):
+        _add_solid_rect(slide.shapes, self._SECTION_BAR_BOX, self.ACCENT_COLOR)
+
+    def _create_content_slide(self, spec: SlideSpec):
         """Create a standard content slide with bullet points."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[1])  # Title and Content layout
+        slide = self._add_slide(self._layout_content)  # Title and Content layout
 
         title = slide.shapes.title
-        title.text = slide_data.get('title', '')
+        title.text = spec.title
 
         content_placeholder = slide.placeholders[1]
         text_frame = content_placeholder.text_frame
         text_frame.clear()
 
         # Add bullet points
-        bullets = self._format_bullet_points(slide_data.get('content', ''))
-
-        for i, bullet in enumerate(bullets):
-            if i == 0:
-                p = text_frame.paragraphs[0]
-            else:
-                p = text_frame.add_paragraph()
-
-            p.text = bullet
-            p.font.size = Pt(18)
-            p.level = 0
+        bullets = spec.bullets
+        if bullets:
+            # The first bullet takes the place of the empty paragraph clear() leaves
+            txBody = text_frame._txBody
+            for p in txBody.p_lst:
+                txBody.remove(p)
+            _append_paragraphs(text_frame, bullets, self._PT_18)
 
         # Add image if present
-        self._add_image_to_slide(slide, slide_data)
+        self._add_image_to_slide(slide, spec)
 
-    def _create_two_column_slide(self, slide_data: Dict[str, Any]):
+    def _create_two_column_slide(self, spec: SlideSpec):
         """Create a two-column layout slide."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[1])
+        slide = self._add_slide(self._layout_content)
 
         title = slide.shapes.title
-        title.text = slide_data.get('title', '')
+        title.text = spec.title
 
         # Remove default content placeholder
-        for shape in slide.shapes:
-            if shape.has_text_frame and shape != title:
-                sp = shape.element
-                sp.getparent().remove(sp)
-
-        # Create two columns
-        left_col_left = Inches(0.5)
-        left_col_top = Inches(1.5)
-        left_col_width = Inches(4.5)
-        left_col_height = Inches(5)
-
-        right_col_left = Inches(5.2)
-        right_col_top = Inches(1.5)
-        right_col_width = Inches(4.5)
-        right_col_height = Inches(5)
+        try:
+            sp = slide.placeholders[1].element
+        except KeyError:
+            pass
+        else:
+            sp.getparent().remove(sp)
 
         # Left column
-        left_box = slide.shapes.add_textbox(left_col_left, left_col_top, left_col_width, left_col_height)
+        left_box = slide.shapes.add_textbox(*self._LEFT_COLUMN_BOX)
         left_frame = left_box.text_frame
         left_frame.word_wrap = True
 
         # Right column
-        right_box = slide.shapes.add_textbox(right_col_left, right_col_top, right_col_width, right_col_height)
+        right_box = slide.shapes.add_textbox(*self._RIGHT_COLUMN_BOX)
         right_frame = right_box.text_frame
         right_frame.word_wrap = True
 
         # Split content or use provided columns
-        content = slide_data.get('content', '')
+        content = spec.content
 
+        # Bullets are parsed once by the shared BaseExporter rules, as in the reveal.js exporter
         if '|' in content:
             left_content, right_content = content.split('|', 1)
+            left_items = self._format_bullet_points(left_content)
+            right_items = self._format_bullet_points(right_content)
         else:
-            # Split bullet points in half
-            bullets = self._format_bullet_points(content)
-            mid = len(bullets) // 2
-            left_content = '\n'.join(bullets[:mid])
-            right_content = '\n'.join(bullets[mid:])
+            # Split bullet points in half; they are already one per line and stripped
+            items = spec.bullets
+            mid = len(items) // 2
+            left_items = items[:mid]
+            right_items = items[mid:]
 
         # Add left content
-        for bullet in left_content.strip().split('\n'):
-            if bullet.strip():
-                p = left_frame.add_paragraph()
-                p.text = bullet.strip().lstrip('*-• ').strip()
-                p.font.size = Pt(16)
+        _append_paragraphs(left_frame, left_items, self._PT_16)
 
         # Add right content or image
-        image_url = slide_data.get('image_url')
+        image_url = spec.image_url
         if image_url and not 'diagram' in image_url.lower():
             # Add image to right column
-            self._add_image_to_slide(slide, slide_data, left=right_col_left, top=right_col_top,
-                                    width=right_col_width, height=right_col_height)
+            self._add_image_to_slide(slide, spec, *self._RIGHT_COLUMN_BOX)
         else:
             # Add text to right column
-            for bullet in right_content.strip().split('\n'):
-                if bullet.strip():
-                    p = right_frame.add_paragraph()
-                    p.text = bullet.strip().lstrip('*-• ').strip()
-                    p.font.size = Pt(16)
+            _append_paragraphs(right_frame, right_items, self._PT_16)
 
-    def _create_quote_slide(self, slide_data: Dict[str, Any]):
+    def _styled_textbox(self, slide, text: str, bbox: Tuple[int, int, int, int], size: Pt,
+                        color: RGBColor, bold: bool = False, italic: bool = False,
+                        align=PP_ALIGN.CENTER):
+        """
+        Add a single-paragraph textbox with the given font styling.
+
+        Args:
+            slide: Slide to add the textbox to
+            text: Paragraph text
+            bbox: (left, top, width, height) of the textbox
+            size: Font size
+            color: Font color
+            bold: Whether the text is bold
+            italic: Whether the text is italic
+            align: Paragraph alignment
+
+        Returns:
+            The textbox's text frame
+        """
+        text_frame = slide.shapes.add_textbox(*bbox).text_frame
+        p = text_frame.paragraphs[0]
+        p.text = text
+        p.alignment = align
+        font = p.font
+        font.size = size
+        if bold:
+            font.bold = True
+        if italic:
+            font.italic = True
+        font.color.rgb = color
+        return text_frame
+
+    def _create_quote_slide(self, spec: SlideSpec):
         """Create a quote slide."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])  # Blank layout
+        slide = self._add_slide(self._layout_blank)  # Blank layout
 
         # Add quote text
-        left = Inches(1)
-        top = Inches(2.5)
-        width = Inches(8)
-        height = Inches(2)
-
-        quote_box = slide.shapes.add_textbox(left, top, width, height)
-        quote_frame = quote_box.text_frame
+        quote_frame = self._styled_textbox(slide, f'"{spec.content}"', self._QUOTE_BOX,
+                                           self._PT_32, self.PRIMARY_COLOR, italic=True)
         quote_frame.word_wrap = True
 
-        p = quote_frame.paragraphs[0]
-        p.text = f'"{slide_data.get("content", "")}"'
-        p.font.size = Pt(32)
-        p.font.italic = True
-        p.alignment = PP_ALIGN.CENTER
-        p.font.color.rgb = self.PRIMARY_COLOR
-
         # Add attribution
-        attr_top = Inches(5)
-        attr_box = slide.shapes.add_textbox(left, attr_top, width, Inches(1))
-        attr_frame = attr_box.text_frame
-
-        attr_p = attr_frame.paragraphs[0]
-        attr_p.text = f"— {slide_data.get('title', '')}"
-        attr_p.font.size = Pt(18)
-        attr_p.alignment = PP_ALIGN.CENTER
-        attr_p.font.color.rgb = self.SECONDARY_COLOR
+        self._styled_textbox(slide, f"— {spec.title}", self._ATTRIBUTION_BOX,
+                             self._PT_18, self.SECONDARY_COLOR)
 
-    def _create_main_point_slide(self, slide_data: Dict[str, Any]):
+    def _create_main_point_slide(self, spec: SlideSpec):
         """Create a slide emphasizing a main point."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        slide = self._add_slide(self._layout_blank)
 
         # Large centered text
-        left = Inches(0.5)
-        top = Inches(2)
-        width = Inches(9)
-        height = Inches(3)
-
-        text_box = slide.shapes.add_textbox(left, top, width, height)
-        text_frame = text_box.text_frame
+        text_frame = self._styled_textbox(slide, spec.title, self._MAIN_POINT_BOX,
+                                          self._PT_60, self.PRIMARY_COLOR, bold=True)
         text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
 
-        p = text_frame.paragraphs[0]
-        p.text = slide_data.get('title', '')
-        p.font.size = Pt(60)
-        p.font.bold = True
-        p.alignment = PP_ALIGN.CENTER
-        p.font.color.rgb = self.PRIMARY_COLOR
-
         # Add supporting text if present
-        content = slide_data.get('content', '')
+        content = spec.content
         if content:
-            content_top = Inches(5.5)
-            content_box = slide.shapes.add_textbox(left, content_top, width, Inches(1.5))
-            content_frame = content_box.text_frame
+            self._styled_textbox(slide, content, self._SUPPORTING_TEXT_BOX,
+                                 self._PT_20, self.SECONDARY_COLOR)
 
-            cp = content_frame.paragraphs[0]
-            cp.text = content
-            cp.font.size = Pt(20)
-            cp.alignment = PP_ALIGN.CENTER
-            cp.font.color.rgb = self.SECONDARY_COLOR
-
-    def _create_big_number_slide(self, slide_data: Dict[str, Any]):
+    def _create_big_number_slide(self, spec: SlideSpec):
         """Create a slide for displaying statistics or big numbers."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
-
-        # Extract number from title (if present)
-        title = slide_data.get('title', '')
+        slide = self._add_slide(self._layout_blank)
 
-        # Huge number
-        left = Inches(0.5)
-        top = Inches(1.5)
-        width = Inches(9)
-        height = Inches(2.5)
-
-        num_box = slide.shapes.add_textbox(left, top, width, height)
-        num_frame = num_box.text_frame
+        # Huge number (taken from the title)
+        num_frame = self._styled_textbox(slide, spec.title, self._BIG_NUMBER_BOX,
+                                         self._PT_88, self.ACCENT_COLOR, bold=True)
         num_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
 
-        p = num_frame.paragraphs[0]
-        p.text = title
-        p.font.size = Pt(88)
-        p.font.bold = True
-        p.alignment = PP_ALIGN.CENTER
-        p.font.color.rgb = self.ACCENT_COLOR
-
         # Description
-        desc_top = Inches(4.5)
-        desc_box = slide.shapes.add_textbox(left, desc_top, width, Inches(2))
-        desc_frame = desc_box.text_frame
+        self._styled_textbox(slide, spec.content, self._NUMBER_DESCRIPTION_BOX,
+                             self._PT_24, self.SECONDARY_COLOR)
 
-        dp = desc_frame.paragraphs[0]
-        dp.text = slide_data.get('content', '')
-        dp.font.size = Pt(24)
-        dp.alignment = PP_ALIGN.CENTER
-        dp.font.color.rgb = self.SECONDARY_COLOR
-
-    def _create_caption_slide(self, slide_data: Dict[str, Any]):
+    def _create_caption_slide(self, spec: SlideSpec):
         """Create a slide with image and caption."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        slide = self._add_slide(self._layout_blank)
 
         # Add image (larger)
-        self._add_image_to_slide(slide, slide_data, left=Inches(1), top=Inches(0.5),
-                                width=Inches(8), height=Inches(5.5))
+        self._add_image_to_slide(slide, spec, *self._CAPTION_IMAGE_BOX)
 
         # Add caption
-        caption_top = Inches(6.2)
-        caption_box = slide.shapes.add_textbox(Inches(1), caption_top, Inches(8), Inches(1))
-        caption_frame = caption_box.text_frame
-
-        p = caption_frame.paragraphs[0]
-        p.text = slide_data.get('title', '')
-        p.font.size = Pt(20)
-        p.alignment = PP_ALIGN.CENTER
-        p.font.color.rgb = self.SECONDARY_COLOR
+        self._styled_textbox(slide, spec.title, self._CAPTION_BOX, self._PT_20, self.SECONDARY_COLOR)
 
-    def _create_blank_slide(self, slide_data: Dict[str, Any]):
+    def _create_blank_slide(self, spec: SlideSpec):
         """Create a blank slide with background image."""
-        slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
+        slide = self._add_slide(self._layout_blank)
 
         # Full-screen image
-        self._add_image_to_slide(slide, slide_data, left=Inches(0), top=Inches(0),
-                                width=self.SLIDE_WIDTH, height=self.SLIDE_HEIGHT)
+        self._add_image_to_slide(slide, spec, 0, 0, self.SLIDE_WIDTH, self.SLIDE_HEIGHT)
 
-    def _add_image_to_slide(self, slide, slide_data: Dict[str, Any],
+    def _add_image_to_slide(self, slide, spec: SlideSpec,
                            left: Optional[Inches] = None, top: Optional[Inches] = None,
                            width: Optional[Inches] = None, height: Optional[Inches] = None):
         """
@@ -377,42 +683,97 @@ class PPTXExporter(BaseExporter):
 
         Images can be from URLs or local paths. They are embedded in the PPTX file.
         """
-        image_url = slide_data.get('image_url')
+        image_url = spec.image_url
 
         if not image_url:
             return
 
         # Default positioning (bottom right corner)
+        default_left, default_top, default_width, default_height = self._DEFAULT_IMAGE_BOX
         if left is None:
-            left = Inches(6)
+            left = default_left
         if top is None:
-            top = Inches(4)
+            top = default_top
         if width is None:
-            width = Inches(3.5)
+            width = default_width
         if height is None:
-            height = Inches(2.5)
+            height = default_height
 
         try:
             # Check if it's a URL or local path
             if image_url.startswith('http://') or image_url.startswith('https://'):
-                # Download image
-                logger.info(f"Downloading image from {image_url}")
-                response = requests.get(image_url, timeout=10)
-                response.raise_for_status()
-                image_stream = io.BytesIO(response.content)
-
-                slide.shapes.add_picture(image_stream, left, top, width=width, height=height)
+                # Prefetched, or downloaded into the cache now
+                path = self._image_cache.get(image_url) or self._get_cached_image(image_url)
+                image = self._prepare_image(path, width, height)
+                self._add_picture(slide, image, left, top, width, height)
 
             else:
                 # Local file
                 if Path(image_url).exists():
-                    slide.shapes.add_picture(str(image_url), left, top, width=width, height=height)
+                    self._add_picture(slide, str(image_url), left, top, width, height)
                 else:
                     logger.warning(f"Image not found: {image_url}")
 
         except Exception as e:
             logger.error(f"Failed to add image {image_url}: {e}")
 
+    def _add_picture(self, slide, image: Union[str, bytes], left: int, top: int, width: int, height: int):
+        """
+        Place an image on a slide, embedding each distinct image only once per deck.
+
+        python-pptx deduplicates image parts too, but finds them by walking every
+        part in the package for each picture. Known images are looked up here by
+        content hash and related to the slide directly.
+
+        Args:
+            slide: Slide to add the picture to
+            image: Image file path or encoded image bytes
+            left, top, width, height: Picture position and size in EMU
+        """
+        blob = image if isinstance(image, bytes) else Path(image).read_bytes()
+        key = hashlib.sha256(blob).digest()
+        image_part = self._image_parts.get(key)
+        if image_part is None:
+            image_file = io.BytesIO(blob) if isinstance(image, bytes) else image
+            image_part, rId = slide.part.get_or_add_image_part(image_file)
+            self._image_parts[key] = image_part
+        else:
+            rId = slide.part.relate_to(image_part, RT.IMAGE)
+
+        shapes = slide.shapes
+        shapes._add_pic_from_image_part(image_part, rId, left, top, width, height)
+        shapes._recalculate_extents()
+
+    def _prepare_image(self, path: Path, width: int, height: int) -> Union[str, bytes]:
+        """
+        Downscale a downloaded image to its display size before embedding.
+
+        Stock photos are often several thousand pixels wide but shown in a few
+        inches, so they are resized to IMAGE_DPI and re-encoded (JPEG at
+        quality 85, or PNG when the image has transparency). Results are
+        memoized so a repeated image is processed once and stays byte-identical,
+        letting python-pptx share a single image part.
+
+        Args:
+            path: Cached image file
+            width: Display width in EMU
+            height: Display height in EMU
+
+        Returns:
+            Encoded image bytes, or the original path if no resize is needed
+        """
+        key = (path, width, height)
+        if key in self._prepared_images:
+            return self._prepared_images[key]
+
+        prepared = _downscale_image(path, self._pixel_size(width, height))
+        self._prepared_images[key] = prepared
+        return prepared
+
+    def _pixel_size(self, width: int, height: int) -> Tuple[int, int]:
+        """Convert a display size in EMU to pixels at IMAGE_DPI."""
+        return int(Emu(width).inches * self.IMAGE_DPI), int(Emu(height).inches * self.IMAGE_DPI)
+
 
 def export_to_pptx(slides_data: List[Dict[str, Any]], output_path: Optional[Path] = None) -> Path:
     """
@@ -426,4 +787,7 @@ def export_to_pptx(slides_data: List[Dict[str, Any]], output_path: Optional[Path
         Path to generated PPTX file
     """
     exporter = PPTXExporter(slides_data, output_path)
-    return exporter.export()
+    try:
+        return exporter.export()
+    finally:
+        exporter.close()
@@ -15,10 +15,21 @@ Usage:
       --log-file build.log
 """
 from __future__ import annotations
-import argparse, json, logging, os, sys, time, yaml, re
+import argparse, copy, functools, json, logging, os, sys, time, yaml, re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 import anthropic
+import orjson
+
+# libyaml's C loader parses far faster; PyYAML builds without it fall back to pure Python
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Marks a static prompt prefix as cacheable (5 minute TTL)
+CACHE_CONTROL = {"type": "ephemeral"}
 
 DEFAULT_OUT = "slides.json"
 DEFAULT_CONFIG = "config.yaml"
@@ -34,7 +45,8 @@ def cli() -> argparse.Namespace:
     p.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
     p.add_argument("--log-file", default=None, help="Write logs to file as well")
     p.add_argument("--model", default="claude-3-7-sonnet-20250219", help="Claude model to use")
-    p.add_argument("--batch-size", type=int, default=5, help="Number of files to process in parallel (batch mode)")
+    p.add_argument("--batch-size", type=int, default=5, help="Number of files to process concurrently (directory mode)")
+    p.add_argument("--batch-api", action="store_true", help="Submit directory guides through the Message Batches API (cheaper, but may take longer)")
     p.add_argument("--force-json", action="store_true", help="Force JSON extraction even if response is not valid JSON")
     return p.parse_args()
 
@@ -60,8 +72,18 @@ def load_config(config_path: Path) -> Dict[str, Any]:
             "slide_defaults": {}
         }
     
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    # Callers get their own copy; the cached dict must never be mutated
+    return copy.deepcopy(_load_config_file(str(config_path), config_path.stat().st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a config file; keyed on mtime so edits are picked up.
+    
+    The result is shared by every caller, so use load_config, which copies it.
+    """
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=YamlLoader)
     
     # Ensure required keys exist
     config.setdefault("prompt_template", "{{content}}")
@@ -79,6 +101,23 @@ def build_prompt(template: str, guide_text: str) -> str:
     return template.replace("{{content}}", guide_text)
 
 
+def build_messages(template: str, guide_text: str) -> list[dict]:
+    """Build the user message for a guide.
+
+    The template text before {{content}} is the same for every guide, so it is
+    sent as its own block marked for prompt caching; together with the tools and
+    system prompt it forms a prefix Claude reuses across requests.
+    """
+    prompt = build_prompt(template, guide_text)
+    prefix, _, suffix = template.partition("{{content}}")
+    if not prefix.strip() or "{{content}}" in suffix:
+        return [{"role": "user", "content": prompt}]
+    return [{"role": "user", "content": [
+        {"type": "text", "text": prefix, "cache_control": CACHE_CONTROL},
+        {"type": "text", "text": guide_text + suffix},
+    ]}]
+
+
 # Insert missing keys and correct ordering
 ORDER = [
     "slide_number", "title", "content", "layout", "chart_type", "diagram_type", "diagram_content",
@@ -91,9 +130,10 @@ def normalize(slides: list[dict], layout_mappings: Dict[str, str], slide_default
     """Normalize slides by adding missing keys and applying layout mappings."""
     fixed = []
     for idx, raw in enumerate(slides, 1):
-        # Apply defaults
+        # Apply defaults; each slide gets its own copy of list/dict values
         for key, value in slide_defaults.items():
-            raw.setdefault(key, value)
+            if key not in raw:
+                raw[key] = copy.deepcopy(value) if isinstance(value, (list, dict)) else value
         
         # Set slide number
         raw.setdefault("slide_number", idx)
@@ -113,26 +153,42 @@ def normalize(slides: list[dict], layout_mappings: Dict[str, str], slide_default
         if layout in layout_mappings:
             raw["layout"] = layout_mappings[layout]
         
-        # Ensure all other keys exist
-        raw.setdefault("chart_type", None)
-        raw.setdefault("image_description", None)
-        raw.setdefault("image_url", None)
-        for key in ORDER:
-            raw.setdefault(key, None)
-        
-        # Create ordered dictionary
+        # Create ordered dictionary; get() fills any missing key with None
         fixed.append({k: raw.get(k) for k in ORDER})
     
     return fixed
 
 
+# Patterns used to dig slide JSON out of free-form model responses
+_ARRAY_RE = re.compile(r'(\[\s*{.*}\s*\])', re.DOTALL)
+_SLIDE_OBJECT_RE = re.compile(r'{\s*"slide_number"\s*:.*?}', re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',\s*}')
+
+
+def _loads(text: str):
+    """Parse JSON with orjson, deferring to json for input only it accepts (NaN, lone surrogates)."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
 def extract_json(text: str, force: bool = False) -> list:
     """Extract JSON array from text, even if surrounded by non-JSON content."""
+    # Fast path: the whole response is an array of objects, which is exactly what
+    # the regex below would match, so parse it without scanning
+    stripped = text.strip()
+    if stripped[:1] == '[' and stripped[-1:] == ']' and stripped[1:].lstrip()[:1] == '{' and stripped[:-1].rstrip()[-1:] == '}':
+        try:
+            return _loads(stripped)
+        except json.JSONDecodeError:
+            pass  # Fall through to the regex search
+    
     # Try to find a JSON array using regex
-    array_match = re.search(r'(\[\s*{.*}\s*\])', text, re.DOTALL)
+    array_match = _ARRAY_RE.search(text)
     if array_match:
         try:
-            return json.loads(array_match.group(1))
+            return _loads(array_match.group(1))
         except json.JSONDecodeError:
             pass  # Fall through to other methods
     
@@ -142,21 +198,21 @@ def extract_json(text: str, force: bool = False) -> list:
     
     if start_idx != -1 and end_idx != -1 and start_idx < end_idx:
         try:
-            return json.loads(text[start_idx:end_idx+1])
+            return _loads(text[start_idx:end_idx+1])
         except json.JSONDecodeError:
             pass  # Fall through to other methods
     
     # If force enabled, try to extract JSON objects and build an array
     if force:
         LOGGER.warning("Attempting to force JSON extraction from malformed response")
-        objects = re.findall(r'{\s*"slide_number"\s*:.*?}', text, re.DOTALL)
+        objects = _SLIDE_OBJECT_RE.findall(text)
         if objects:
             result = []
             for obj_str in objects:
                 try:
                     # Replace any trailing commas that would make the JSON invalid
-                    obj_str = re.sub(r',\s*}', '}', obj_str)
-                    obj = json.loads(obj_str)
+                    obj_str = _TRAILING_COMMA_RE.sub('}', obj_str)
+                    obj = _loads(obj_str)
                     result.append(obj)
                 except json.JSONDecodeError:
                     continue
@@ -168,6 +224,80 @@ def extract_json(text: str, force: bool = False) -> list:
     raise json.JSONDecodeError("Could not extract valid JSON from response", text, 0)
 
 
+# Tool schema used to get structured slides back from Claude
+SLIDE_TOOLS = [
+    {
+        "name": "generate_slides",
+        "description": "Generate slides from facilitator guide",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "slides": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "slide_number": {"type": "integer"},
+                            "title": {"type": "string"},
+                            "content": {"type": "string"},
+                            "layout": {"type": "string"},
+                            "chart_type": {"type": ["string", "null"]},
+                            "diagram_type": {"type": ["string", "null"]},
+                            "diagram_content": {"type": ["string", "null"]},
+                            "image_description": {"type": ["string", "null"]},
+                            "image_url": {"type": ["string", "null"]},
+                            "facilitator_notes": {"type": ["string", "null"]},
+                            "start_time": {"type": ["string", "null"]},
+                            "end_time": {"type": ["string", "null"]},
+                            "materials": {"type": ["string", "null"]},
+                            "worksheet": {"type": ["string", "null"]},
+                            "improvements": {"type": ["string", "null"]},
+                            "notes": {"type": ["string", "null"]}
+                        },
+                        "required": ["slide_number", "title", "content", "layout"]
+                    }
+                }
+            },
+            "required": ["slides"]
+        }
+    }
+]
+
+TOOL_SYSTEM_PROMPT = [{
+    "type": "text",
+    "text": "You are an expert at converting facilitator guides into well-structured slide content. Return valid JSON only.",
+    "cache_control": CACHE_CONTROL,
+}]
+TEXT_SYSTEM_PROMPT = [{
+    "type": "text",
+    "text": "Return JSON only. Your response should be a valid JSON array of slide objects, each with slide_number, title, content, and other fields.",
+    "cache_control": CACHE_CONTROL,
+}]
+MAX_TOKENS = 16_000
+
+# Directories with fewer guides than this skip the Message Batches API; a
+# batch round-trip is slower than a few direct requests
+MIN_BATCH_API_FILES = 4
+BATCH_POLL_INTERVAL = 10  # seconds between batch status checks
+BATCH_MAX_WAIT = 2 * 60 * 60  # seconds before giving up on a batch and sending direct requests
+
+
+def tool_slides(message) -> list | None:
+    """Return the slides from a generate_slides tool call in a Claude message, if any."""
+    for content in message.content:
+        if hasattr(content, 'type') and content.type == "tool_use" and content.name == "generate_slides":
+            return content.input["slides"]
+    return None
+
+
+def write_slides(slides: list[dict], config: Dict[str, Any], out_path: Path) -> Path:
+    """Normalize slides and write them to out_path."""
+    slides = normalize(slides, config["layout_mappings"], config["slide_defaults"])
+    out_path.write_bytes(orjson.dumps(slides, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    LOGGER.info("Wrote %d slides → %s", len(slides), out_path)
+    return out_path
+
+
 def process_guide(guide_path: Path, config: Dict[str, Any], out_path: Path | None, model: str, client: anthropic.Anthropic, force_json: bool = False) -> Path:
     """Process a single guide file and return the output path."""
     LOGGER.info("Processing guide: %s", guide_path)
@@ -178,47 +308,7 @@ def process_guide(guide_path: Path, config: Dict[str, Any], out_path: Path | Non
     
     # Read guide and build prompt
     guide_txt = guide_path.read_text(encoding="utf-8")
-    prompt = build_prompt(config["prompt_template"], guide_txt)
-    
-    # Define tool for JSON extraction
-    tools = [
-        {
-            "name": "generate_slides",
-            "description": "Generate slides from facilitator guide",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "slides": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "slide_number": {"type": "integer"},
-                                "title": {"type": "string"},
-                                "content": {"type": "string"},
-                                "layout": {"type": "string"},
-                                "chart_type": {"type": ["string", "null"]},
-                                "diagram_type": {"type": ["string", "null"]},
-                                "diagram_content": {"type": ["string", "null"]},
-                                "image_description": {"type": ["string", "null"]},
-                                "image_url": {"type": ["string", "null"]},
-                                "facilitator_notes": {"type": ["string", "null"]},
-                                "start_time": {"type": ["string", "null"]},
-                                "end_time": {"type": ["string", "null"]},
-                                "materials": {"type": ["string", "null"]},
-                                "worksheet": {"type": ["string", "null"]},
-                                "improvements": {"type": ["string", "null"]},
-                                "notes": {"type": ["string", "null"]}
-                            },
-                            "required": ["slide_number", "title", "content", "layout"]
-                        }
-                    }
-                },
-                "required": ["slides"]
-            }
-
-        }
-    ]
+    messages = build_messages(config["prompt_template"], guide_txt)
     
     # Request Claude with retries
     max_attempts = 3
@@ -230,34 +320,26 @@ def process_guide(guide_path: Path, config: Dict[str, Any], out_path: Path | Non
             try:
                 rsp = client.messages.create(
                     model=model,
-                    max_tokens=16_000,
-                    system="You are an expert at converting facilitator guides into well-structured slide content. Return valid JSON only.",
-                    messages=[{"role": "user", "content": prompt}],
-                    tools=tools
+                    max_tokens=MAX_TOKENS,
+                    system=TOOL_SYSTEM_PROMPT,
+                    messages=messages,
+                    tools=SLIDE_TOOLS
                 )
                 
                 # Extract JSON from tool use
-                slides = None
-                for content in rsp.content:
-                    if hasattr(content, 'type') and content.type == "tool_use" and content.name == "generate_slides":
-                        slides = content.input["slides"]
-                        break
+                slides = tool_slides(rsp)
                 
                 if slides:
-                    # Normalize and save
-                    slides = normalize(slides, config["layout_mappings"], config["slide_defaults"])
-                    out_path.write_text(json.dumps(slides, indent=2, ensure_ascii=False))
-                    LOGGER.info("Wrote %d slides → %s", len(slides), out_path)
-                    return out_path
+                    return write_slides(slides, config, out_path)
             except Exception as e:
                 LOGGER.warning("Tool-based approach failed: %s. Falling back to text extraction.", e)
             
             # Fallback to traditional approach
             rsp = client.messages.create(
                 model=model,
-                max_tokens=16_000,
-                system="Return JSON only. Your response should be a valid JSON array of slide objects, each with slide_number, title, content, and other fields.",
-                messages=[{"role": "user", "content": prompt}],
+                max_tokens=MAX_TOKENS,
+                system=TEXT_SYSTEM_PROMPT,
+                messages=messages,
             )
             
             raw = rsp.content[0].text
@@ -281,10 +363,7 @@ def process_guide(guide_path: Path, config: Dict[str, Any], out_path: Path | Non
                     raise
             
             # Normalize and save
-            slides = normalize(slides, config["layout_mappings"], config["slide_defaults"])
-            out_path.write_text(json.dumps(slides, indent=2, ensure_ascii=False))
-            LOGGER.info("Wrote %d slides → %s", len(slides), out_path)
-            return out_path
+            return write_slides(slides, config, out_path)
             
         except (anthropic.APIError, anthropic.APITimeoutError, anthropic.APIConnectionError) as e:
             if attempt < max_attempts - 1:
@@ -298,7 +377,85 @@ def process_guide(guide_path: Path, config: Dict[str, Any], out_path: Path | Non
     raise RuntimeError("Failed to process guide, this should not happen")  # Unreachable
 
 
-def process_directory(guide_dir: Path, config: Dict[str, Any], model: str, batch_size: int, client: anthropic.Anthropic, force_json: bool = False) -> List[Path]:
+def process_guides(md_files: List[Path], config: Dict[str, Any], model: str, batch_size: int, client: anthropic.Anthropic, force_json: bool = False) -> List[Path]:
+    """Process guides with direct requests, keeping up to batch_size in flight."""
+    # Guides are independent, I/O-bound Claude calls; batch_size bounds how many
+    # are in flight at once so we don't overwhelm the API
+    def process_one(guide_path: Path) -> Path | None:
+        try:
+            return process_guide(guide_path, config, None, model, client, force_json)
+        except Exception as e:
+            LOGGER.error("Failed to process %s: %s", guide_path, e, exc_info=True)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(batch_size, len(md_files)))) as executor:
+        return [out_path for out_path in executor.map(process_one, md_files) if out_path]
+
+
+def process_directory_batched(md_files: List[Path], config: Dict[str, Any], model: str, batch_size: int, client: anthropic.Anthropic, force_json: bool = False) -> List[Path]:
+    """Process guides through the Message Batches API.
+
+    Every guide's tool-based request goes out in a single batch, which runs
+    server-side in parallel at a reduced token price. Guides whose batch result
+    errored, expired or carried no slides are retried with direct requests, as
+    is the whole directory if the batch cannot be created, polled or finished
+    within BATCH_MAX_WAIT.
+    """
+    # custom_id must be short and unique, and stems can collide (guide.md / guide.txt)
+    requests = [
+        {
+            "custom_id": f"guide-{i}",
+            "params": {
+                "model": model,
+                "max_tokens": MAX_TOKENS,
+                "system": TOOL_SYSTEM_PROMPT,
+                "messages": build_messages(config["prompt_template"], guide_path.read_text(encoding="utf-8")),
+                "tools": SLIDE_TOOLS,
+            },
+        }
+        for i, guide_path in enumerate(md_files)
+    ]
+
+    written: Dict[Path, Path] = {}
+    batch = None
+    try:
+        batch = client.messages.batches.create(requests=requests)
+        LOGGER.info("Submitted message batch %s with %d guides", batch.id, len(requests))
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        while batch.processing_status != "ended":
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"batch {batch.id} still {batch.processing_status} after {BATCH_MAX_WAIT}s")
+            time.sleep(BATCH_POLL_INTERVAL)
+            batch = client.messages.batches.retrieve(batch.id)
+            LOGGER.debug("Batch %s: %s", batch.id, batch.request_counts)
+
+        for entry in client.messages.batches.results(batch.id):
+            guide_path = md_files[int(entry.custom_id.rsplit("-", 1)[1])]
+            slides = tool_slides(entry.result.message) if entry.result.type == "succeeded" else None
+            if not slides:
+                LOGGER.warning("Batch result for %s was %s without slides", guide_path.name, entry.result.type)
+                continue
+            try:
+                written[guide_path] = write_slides(slides, config, guide_path.with_name(f"slides_{guide_path.stem}.json"))
+            except Exception as e:
+                LOGGER.error("Failed to process %s: %s", guide_path, e, exc_info=True)
+    except (anthropic.APIError, TimeoutError) as e:
+        LOGGER.warning("Message batch failed (%s); falling back to direct requests", e)
+        if batch is not None and batch.processing_status != "ended":
+            try:
+                client.messages.batches.cancel(batch.id)
+            except anthropic.APIError as cancel_error:
+                LOGGER.warning("Could not cancel batch %s: %s", batch.id, cancel_error)
+
+    results = [written[guide_path] for guide_path in md_files if guide_path in written]
+    remaining = [guide_path for guide_path in md_files if guide_path not in written]
+    if remaining:
+        LOGGER.info("Retrying %d guides with direct requests", len(remaining))
+        results += process_guides(remaining, config, model, batch_size, client, force_json)
+    return results
+
+
+def process_directory(guide_dir: Path, config: Dict[str, Any], model: str, batch_size: int, client: anthropic.Anthropic, force_json: bool = False, use_batch_api: bool = False) -> List[Path]:
     """Process all markdown files in a directory."""
     LOGGER.info("Processing all markdown files in: %s", guide_dir)
     
@@ -310,20 +467,12 @@ def process_directory(guide_dir: Path, config: Dict[str, Any], model: str, batch
     
     LOGGER.info("Found %d files to process", len(md_files))
     
-    # Process files in batches to avoid overwhelming the API
-    results = []
-    for i in range(0, len(md_files), batch_size):
-        batch = md_files[i:i + batch_size]
-        LOGGER.info("Processing batch %d/%d (%d files)", i // batch_size + 1, 
-                   (len(md_files) + batch_size - 1) // batch_size, len(batch))
-        
-        for guide_path in batch:
-            try:
-                out_path = process_guide(guide_path, config, None, model, client, force_json)
-                results.append(out_path)
-            except Exception as e:
-                LOGGER.error("Failed to process %s: %s", guide_path, e, exc_info=True)
-    
+    if use_batch_api and len(md_files) >= MIN_BATCH_API_FILES:
+        results = process_directory_batched(md_files, config, model, batch_size, client, force_json)
+    else:
+        results = process_guides(md_files, config, model, batch_size, client, force_json)
+
+    LOGGER.info("Processed %d/%d files", len(results), len(md_files))
     return results
 
 
@@ -356,7 +505,7 @@ def main():
             LOGGER.warning("--out parameter ignored in directory mode")
         
         # Process directory
-        process_directory(guide_path, config, args.model, args.batch_size, client, args.force_json)
+        process_directory(guide_path, config, args.model, args.batch_size, client, args.force_json, args.batch_api)
         
     else:
         # Single file mode
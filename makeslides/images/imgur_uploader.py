@@ -5,12 +5,21 @@ Imgur API image uploader - replaces temporary litterbox hosting.
 Free tier allows unlimited anonymous uploads with permanent hosting.
 Images uploaded anonymously can be deleted within the first 24 hours.
 """
+import functools
+import hashlib
+import io
 import os
 import sys
 import time
 import logging
-import base64
+import threading
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.fields import RequestField
+from urllib3.filepost import encode_multipart_formdata
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, Dict, Any
 from urllib.parse import urlparse
@@ -21,21 +30,156 @@ logger = logging.getLogger(__name__)
 IMGUR_API_URL = "https://api.imgur.com/3/upload"
 IMGUR_CLIENT_ID = os.getenv("IMGUR_CLIENT_ID", "546c25a59c58ad7")  # Public anonymous client ID
 
+# Content hash → Imgur URL for every image uploaded, so unchanged files are never sent twice
+URL_CACHE_FILE = Path.home() / ".cache" / "makeslides" / "imgur_urls.json"
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Longest we'll sleep on a 429 before retrying, whatever reset time Imgur reports
+RATE_LIMIT_MAX_WAIT = 60
+
+# Directory uploads run in parallel, throttled to Imgur's documented 1250 requests/hour
+UPLOAD_WORKERS = 8
+UPLOAD_RATE_PER_HOUR = 1250
+UPLOAD_BURST = 50
+
+
+def _file_sha256(path: str) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_session() -> requests.Session:
+    """Process-wide session, so every uploader reuses the same keep-alive connections to Imgur."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=2 * UPLOAD_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=0.5),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _MultipartUpload:
+    """multipart/form-data body that streams one file from disk.
+
+    requests sends a file-like body block by block under a Content-Length, so
+    memory stays flat however large the image or however many uploads run at
+    once; files= would encode the whole body in memory first.
+    """
+
+    def __init__(self, fields: Dict[str, str], name: str, path: str):
+        file_field = RequestField(name=name, data=b'', filename=os.path.basename(path))
+        file_field.make_multipart(content_type='application/octet-stream')
+        # Encode everything with an empty file part, then splice the file in before the closing boundary
+        encoded, self.content_type = encode_multipart_formdata(list(fields.items()) + [file_field])
+        boundary = self.content_type.split('boundary=', 1)[1]
+        tail = f"\r\n--{boundary}--\r\n".encode('latin-1')
+        self._file = open(path, 'rb')
+        self._parts = [io.BytesIO(encoded[:-len(tail)]), self._file, io.BytesIO(tail)]
+        self.len = len(encoded) + os.fstat(self._file.fileno()).st_size
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._parts and size != 0:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b''.join(chunks)
+
+    def __iter__(self):
+        return iter(lambda: self.read(READ_CHUNK_SIZE), b'')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+class _TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Going negative reserves a future token, so waiters queue up fairly
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
 class ImgurUploader:
     """Upload images to Imgur for permanent hosting."""
 
-    def __init__(self, client_id: Optional[str] = None):
+    def __init__(self, client_id: Optional[str] = None, url_cache: Optional[Path] = URL_CACHE_FILE):
         """
         Initialize Imgur uploader.
 
         Args:
             client_id: Imgur API client ID. If not provided, uses anonymous uploads.
+            url_cache: JSON file remembering the URL of each uploaded image by
+                content hash, or None to always upload.
         """
         self.client_id = client_id or IMGUR_CLIENT_ID
-        self.session = requests.Session()
-        self.session.headers.update({
+        # The session is shared between uploaders, so auth goes on each request
+        self.session = _shared_session()
+        self.headers = {
             "Authorization": f"Client-ID {self.client_id}"
-        })
+        }
+        self._rate_limiter = _TokenBucket(UPLOAD_RATE_PER_HOUR / 3600, UPLOAD_BURST)
+        self.url_cache = url_cache
+        self._urls: Optional[Dict[str, str]] = None  # loaded on first use
+        self._urls_lock = threading.Lock()
+
+    def _cached_urls(self) -> Dict[str, str]:
+        """Hash → URL map from the cache file; call with _urls_lock held."""
+        if self._urls is None:
+            self._urls = {}
+            if self.url_cache.exists():
+                try:
+                    self._urls = orjson.loads(self.url_cache.read_bytes())
+                except (OSError, orjson.JSONDecodeError) as e:
+                    logger.warning(f"Ignoring unreadable Imgur URL cache {self.url_cache}: {e}")
+        return self._urls
+
+    def _lookup_url(self, digest: str) -> Optional[str]:
+        with self._urls_lock:
+            return self._cached_urls().get(digest)
+
+    def _remember_url(self, digest: str, url: str):
+        """Record an upload and rewrite the cache file atomically."""
+        with self._urls_lock:
+            urls = self._cached_urls()
+            urls[digest] = url
+            tmp_path = self.url_cache.with_name(f".{self.url_cache.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                self.url_cache.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_bytes(orjson.dumps(urls))
+                os.replace(tmp_path, self.url_cache)
+            except OSError as e:
+                logger.warning(f"Could not update Imgur URL cache {self.url_cache}: {e}")
+                tmp_path.unlink(missing_ok=True)
 
     def upload_image(self, image_path: str, title: Optional[str] = None,
                     description: Optional[str] = None, max_retries: int = 3) -> Optional[str]:
@@ -61,28 +205,33 @@ class ImgurUploader:
             logger.error(f"Image too large: {file_size / 1024 / 1024:.2f}MB (max 10MB)")
             return None
 
+        digest = None
+        if self.url_cache:
+            digest = _file_sha256(image_path)
+            cached_url = self._lookup_url(digest)
+            if cached_url:
+                logger.info(f"Already uploaded {image_path}: {cached_url}")
+                return cached_url
+
         logger.info(f"Uploading {image_path} to Imgur...")
 
         for attempt in range(max_retries):
             try:
-                # Read image and encode to base64
-                with open(image_path, 'rb') as f:
-                    image_data = base64.b64encode(f.read()).decode('utf-8')
-
-                # Prepare payload
-                payload = {
-                    'image': image_data,
-                    'type': 'base64'
-                }
-
-                if title:
-                    payload['title'] = title
-                if description:
-                    payload['description'] = description
-
-                # Upload to Imgur
-                response = self.session.post(IMGUR_API_URL, data=payload)
-
+                # Send the file as multipart/form-data, streamed from disk rather
+                # than base64-encoded or buffered whole
+                fields = {'title': title, 'description': description}
+                # Only actual POSTs spend rate-limit tokens, not cache hits
+                self._rate_limiter.acquire()
+                with _MultipartUpload({key: value for key, value in fields.items() if value},
+                                      'image', image_path) as body:
+                    response = self.session.post(
+                        IMGUR_API_URL,
+                        data=body,
+                        headers={**self.headers, 'Content-Type': body.content_type},
+                        stream=True
+                    )
+
+                # The body is only read on success; error responses are closed unread
                 if response.status_code == 200:
                     data = response.json()
 
@@ -95,17 +244,22 @@ class ImgurUploader:
                         if delete_hash:
                             logger.info(f"   Delete hash (save this to delete within 24h): {delete_hash}")
 
+                        if digest:
+                            self._remember_url(digest, image_url)
                         return image_url
                     else:
                         logger.error(f"Upload failed: {data.get('data', {}).get('error', 'Unknown error')}")
 
                 elif response.status_code == 429:
                     # Rate limit hit
-                    logger.warning(f"Rate limit hit, waiting before retry...")
-                    time.sleep(2 ** attempt)
+                    response.close()
+                    wait_time = self._rate_limit_wait(response, attempt)
+                    logger.warning(f"Rate limit hit, waiting {wait_time:.0f}s before retry...")
+                    time.sleep(wait_time)
 
                 else:
-                    logger.error(f"Upload failed with status {response.status_code}: {response.text}")
+                    response.close()
+                    logger.error(f"Upload failed with status {response.status_code} {response.reason}")
 
             except requests.exceptions.RequestException as e:
                 logger.error(f"Upload attempt {attempt + 1}/{max_retries} failed: {e}")
@@ -122,6 +276,15 @@ class ImgurUploader:
         logger.error(f"Failed to upload image after {max_retries} attempts")
         return None
 
+    @staticmethod
+    def _rate_limit_wait(response: requests.Response, attempt: int) -> float:
+        """Seconds to wait after a 429, from Imgur's reset headers when present."""
+        for header in ('Retry-After', 'X-Post-Rate-Limit-Reset'):
+            value = response.headers.get(header)
+            if value and value.isdigit():
+                return min(int(value), RATE_LIMIT_MAX_WAIT)
+        return 2 ** attempt
+
     def upload_directory(self, directory: str, pattern: str = "*.png") -> Dict[str, str]:
         """
         Upload all images in a directory matching a pattern.
@@ -149,21 +312,24 @@ class ImgurUploader:
 
         url_mapping = {}
 
-        for i, image_path in enumerate(image_files, 1):
-            logger.info(f"Uploading {i}/{len(image_files)}: {image_path.name}")
-
+        def upload(image_path: Path) -> Optional[str]:
             # Create title from filename
             title = image_path.stem.replace('_', ' ').title()
+            return self.upload_image(str(image_path), title=title)
+
+        # Submit everything up front so all workers stay busy, then collect as they finish
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(image_files))) as executor:
+            futures = {executor.submit(upload, image_path): image_path for image_path in image_files}
 
-            url = self.upload_image(str(image_path), title=title)
+            for i, future in enumerate(as_completed(futures), 1):
+                image_path = futures[future]
+                url = future.result()
 
-            if url:
-                url_mapping[str(image_path)] = url
-                # Small delay to avoid rate limiting
-                if i < len(image_files):
-                    time.sleep(0.5)
-            else:
-                logger.warning(f"Failed to upload {image_path.name}")
+                if url:
+                    url_mapping[str(image_path)] = url
+                    logger.info(f"Uploaded {i}/{len(image_files)}: {image_path.name}")
+                else:
+                    logger.warning(f"Failed to upload {image_path.name}")
 
         logger.info(f"Successfully uploaded {len(url_mapping)}/{len(image_files)} images")
 
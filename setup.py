@@ -15,8 +15,9 @@ setup(
     packages=find_packages(exclude=("tests*", "examples*")),
     python_requires=">=3.9",
     install_requires=[
-        "anthropic>=0.18.0",
+        "anthropic>=0.42.0",
         "pyyaml>=6.0.1",
+        "orjson>=3.8.3",
         "requests>=2.32.0",
         "tqdm>=4.66.0",
         "pillow>=10.0.0",
@@ -39,6 +40,7 @@ setup(
             "slides-build   = makeslides.slides.builder:cli_entry",
         ]
     },
+    package_data={"makeslides.diagrams": ["mermaid_server.mjs"]},
     include_package_data=True,   # so templates / configs bundled via MANIFEST.in later
     license="MIT",
     classifiers=[